@@ -3,28 +3,385 @@
 FRED API + OECD 데이터를 수집하여 JSON 파일로 저장
 
 사용법:
-  FRED_API_KEY=your_key python fetch_data.py
+  FRED_API_KEY=your_key python fetch_data.py [--jobs 8] [--async]
+                                             [--incremental [--revision-days 120] [--verify-incremental]] [--skip-unchanged]
+                                             [--plan-releases] [--min-interval] [--force] [--only macro-2.html | m2.json ...]
+                                             [--cache-ttl 3600 | --no-cache]
+                                             [--deadline 600] [--record DIR | --replay DIR [--replay-speed 1]]
+  (비동기 서비스에 포함할 때: await fetch_data.async_main() — 태스크는 코루틴, HTTP 만 fetch 풀 스레드)
+  (로컬 대역 서버로 실행: FRED_BASE=http://127.0.0.1:8765/fred — fred_stub.py 참고)
 
 필요한 패키지:
-  pip install requests
+  pip install requests numpy
 """
 
 import os
+import re
+import sys
 import json
+import hashlib
+import time
+import random
+import asyncio
+import contextvars
+import argparse
+import threading
+import numpy as np
 import requests
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque
+from requests.adapters import HTTPAdapter
+from concurrent.futures import FIRST_COMPLETED, Future, InvalidStateError, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
 FRED_KEY = os.environ.get("FRED_API_KEY", "")
-FRED_BASE = "https://api.stlouisfed.org/fred/series/observations"
+FRED_ROOT = os.environ.get("FRED_BASE", "https://api.stlouisfed.org/fred").rstrip("/")  # 로컬 대역 서버: fred_stub.py
+FRED_BASE = f"{FRED_ROOT}/series/observations"
+FRED_SERIES_URL = f"{FRED_ROOT}/series"  # 시리즈 메타데이터 (last_updated)
+FRED_RELEASE_URL = f"{FRED_ROOT}/series/release"       # 시리즈 → 발표(release)
+FRED_RELEASE_DATES_URL = f"{FRED_ROOT}/release/dates"  # 발표 일정
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
+STATE_PATH = DATA_DIR / "_state.json"  # 실행 간 유지되는 상태 (서킷 브레이커 등)
+RAW_DIR = DATA_DIR / "raw"  # incremental 모드용 원본 관측치 저장소 (시리즈·주기별)
+DERIVED_DIR = DATA_DIR / "derived"  # incremental 모드용 변환 결과 저장소 (그래프 노드별)
+CACHE_DIR = Path(__file__).parent / ".cache" / "fred"  # 로컬 응답 캐시 (git 제외)
 
 TODAY = datetime.now().strftime("%Y-%m-%d")
 
+FETCH_JOBS = 8  # 동시 FRED 요청 수 (--jobs 로 변경)
+_fetch_pool = None
+_hedge_pool = None  # 헤지 요청용 (fetch 풀 작업자가 기다리므로 별도 풀)
+_fetch_slots = None  # 호출 스레드와 무관하게 동시 HTTP 요청 수를 FETCH_JOBS로 제한
+_session = None
+_fetch_pool_lock = threading.Lock()
+
+INCREMENTAL = False   # --incremental: 저장된 마지막 관측일 이후(+수정 구간)만 요청
+REVISION_DAYS = 120   # 마지막 관측일에서 이만큼 거슬러 올라가 다시 받음 (데이터 수정 반영)
+SKIP_UNCHANGED = False  # --skip-unchanged: 메타데이터 last_updated 가 그대로면 저장본 사용
+_series_meta = {}       # 실행 중 조회한 series_id → last_updated (시리즈당 1회)
+_raw_changes = {}       # (series_id, freq) → 저장본 대비 처음 바뀐 관측일 (None = 변화 없음, "" = 알 수 없음)
+VERIFY_INCREMENTAL = False  # --verify-incremental: 변환 꼬리 재계산 결과를 전체 재계산과 비교
+
+CACHE_ENABLED = True  # --no-cache 로 끔
+CACHE_TTL = 3600      # 이 시간(초) 안의 캐시는 요청 없이 사용, 지나면 조건부 요청으로 재검증
+
+FRED_RATE_LIMIT = 120  # FRED API 키당 분당 요청 한도 — 어떤 60초 구간에서도 이 이상 보내지 않음
+RATE_LIMIT_RETRIES = 3  # 429 응답 시 Retry-After 만큼 쉬고 다시 시도하는 횟수
+_rate_limiter = None
+
+FETCH_RETRIES = 3      # 일시적 오류(연결·타임아웃·5xx) 재시도 횟수
+BACKOFF_BASE = 1.0     # 재시도 대기: 0 ~ BACKOFF_BASE * 2^n 초 사이 무작위 (full jitter)
+BACKOFF_MAX = 20.0
+FRED_TIMEOUT = (5, 20)  # (연결, 읽기) 타임아웃 초 — 멈춘 연결이 30초씩 잡아먹지 않게
+
+BREAKER_THRESHOLD = 3      # 이만큼 연속 실행에서 실패한 시리즈는 차단
+BREAKER_COOLDOWN_DAYS = 7  # 차단 후 이 기간이 지나면 재시도 없이 1번만 시험 요청
+
+RUN_DEADLINE = None  # --deadline: 이 시각(time.monotonic)이 지나면 새 요청/저장 중단
+
+RUN_STATE = {}  # STATE_PATH 내용 — start_run 에서 읽고 finish_run 에서 저장
+_state_lock = threading.Lock()
+_run_failed = set()  # 이번 실행에서 실패/성공한 시리즈 (서킷 브레이커 갱신용)
+_run_succeeded = set()
+
+FALLBACK_HEDGE_DELAY = 3.0  # 1순위 시리즈가 이 시간(초) 안에 끝나지 않으면 대체 시리즈도 동시에 요청
+
+HEDGE_REQUESTS = False  # --hedge: 응답이 이번 실행의 p90 지연보다 늦으면 같은 요청을 하나 더 보냄
+HEDGE_QUANTILE = 0.9
+HEDGE_MIN_SAMPLES = 10  # 지연 표본이 이보다 적으면 헤지하지 않음
+_latencies = []         # 이번 실행에서 완료된 observations 요청 지연(초)
+
+STREAM_PARSE = True  # observations 응답을 청크 단위로 파싱 (--no-stream 이면 r.json())
+
+_inflight = {}  # 실행 중 (series_id, freq) → InflightFetch — 같은 시리즈 요청을 하나로 합침
+_inflight_lock = threading.Lock()
+
+RECORD_DIR = None   # --record DIR: 모든 HTTP 응답(상태·헤더·본문·지연)을 녹화
+REPLAY_DIR = None   # --replay DIR: 녹화본으로 응답 (네트워크 없음)
+REPLAY_SPEED = 1.0  # 재생 지연 배율 (0 = 지연 없이)
+_replay_counts = Counter()  # 녹화/재생 키별 순번 (같은 요청이 여러 번이면 순서대로)
+_replay_lock = threading.Lock()
+
+RUN_STATS = Counter()  # 실행 단위 카운터 (bytes, incremental 등)
+_stats_lock = threading.Lock()
+
+
+def count_stat(key, n=1):
+    """스레드 안전한 실행 통계 누적"""
+    with _stats_lock:
+        RUN_STATS[key] += n
+
+
+class CircuitOpenError(Exception):
+    """연속 실패로 차단된 시리즈 — 요청 없이 바로 실패"""
+
+
+class DeadlineExceeded(Exception):
+    """실행 전체 제한 시간(--deadline) 초과"""
+
+
+class FetchCancelled(Exception):
+    """더 필요 없어져 취소된 요청 (대체 체인에서 다른 후보가 먼저 채택됨)"""
+
+
+class CancelToken:
+    """
+    취소 신호 (threading.Event 와 같은 set/is_set/wait) + 하위 토큰 전파.
+    요청(InflightFetch)의 토큰이 취소되면 그 요청의 헤지 시도 토큰도 함께 취소되고,
+    헤지에서 진 시도는 자기 토큰만 취소됨
+    """
+
+    def __init__(self, parent=None):
+        self.event = threading.Event()
+        self.children = []
+        self.lock = threading.Lock()
+        if parent is not None:
+            parent.link(self)
+
+    def link(self, child):
+        with self.lock:
+            self.children.append(child)
+            cancelled = self.event.is_set()
+        if cancelled:
+            child.set()
+
+    def set(self):
+        with self.lock:
+            self.event.set()
+            children = list(self.children)
+        for child in children:
+            child.set()
+
+    def is_set(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        return self.event.wait(timeout)
+
+
+class InflightFetch:
+    """
+    coalescer 항목 — (series_id, freq) 요청 1건.
+    future: 결과 (dates, values), sent: 첫 HTTP 전송 시각(time.monotonic, 요청 없이 끝났으면 완료 시각),
+    calls: 이 요청을 쓴 태스크 쪽 fred_fetch 호출 수 (plan_fetches 선제 요청 제외), cancel: 설정되면 채우던 스레드가 다음 확인 지점(레이트 리밋 대기·전송 직전·청크 사이)에서 FetchCancelled
+    """
+
+    def __init__(self, start):
+        self.start = start
+        self.future = Future()
+        self.sent = Future()
+        self.calls = 0
+        self.cancel = CancelToken()
+
+    def mark_sent(self):
+        try:
+            self.sent.set_result(time.monotonic())
+        except InvalidStateError:
+            pass  # 이미 기록됨 (헤지/재시도로 여러 번 전송)
+
+
+_current_fetch = contextvars.ContextVar("current_fetch", default=None)  # 이 스레드가 채우는 InflightFetch (전송 시각 기록)
+_current_cancel = contextvars.ContextVar("current_cancel", default=None)  # 지금 HTTP 시도의 CancelToken
+
+
+def check_cancelled():
+    """지금 시도가 취소됐으면(요청 취소 또는 헤지에서 짐) FetchCancelled"""
+    cancel = _current_cancel.get()
+    if cancel is not None and cancel.is_set():
+        raise FetchCancelled("fetch cancelled")
+
+
+def remaining_time():
+    """실행 제한 시간까지 남은 초 (제한 없으면 None)"""
+    if RUN_DEADLINE is None:
+        return None
+    return RUN_DEADLINE - time.monotonic()
+
+
+def check_deadline():
+    """제한 시간이 지났으면 DeadlineExceeded"""
+    left = remaining_time()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("run deadline exceeded")
+
 
 def fred_fetch(series_id, start="2000-01-01", freq=None):
-    """FRED API에서 시계열 데이터 가져오기"""
+    """
+    FRED API에서 시계열 데이터 가져오기. Returns: (dates datetime64[D] 배열, values array('d'))
+    같은 실행 안에서 같은 (시리즈, 주기)를 이미 더 이른 시작일로 요청했다면
+    그 결과(진행 중이면 완료까지 대기)를 공유하고 시작일만 잘라서 반환
+    """
+    while True:
+        owner, entry = claim_fetch(series_id, start, freq)
+        if owner:
+            resolve_fetch(series_id, start, freq, entry)
+        try:
+            return since_start(*entry.future.result(), start)
+        except FetchCancelled:
+            continue  # 공유하던 대체 후보 요청이 취소됨 — 새로 요청
+
+
+def since_start(dates, values, start):
+    """start 이후 관측치만"""
+    i = int(np.searchsorted(dates, np.datetime64(start, "D")))
+    return dates[i:], values[i:]
+
+
+def claim_fetch(series_id, start, freq, planned=False):
+    """
+    (series_id, freq) 요청 자리 잡기 (planned: plan_fetches 의 선제 요청 — fetch_calls 통계에서 제외).
+    Returns: (owner, InflightFetch) — owner 면 호출 쪽이 resolve_fetch 로 채워야 하고, 아니면 기존 요청을 공유.
+    취소된 요청에는 붙지 않음. coalesced 는 다른 fred_fetch 호출이 이미 쓴 요청에 붙은 경우만 셈 —
+    plan_fetches 가 미리 잡아 둔 요청을 처음 쓰는 호출은 합쳐진 게 아님
+    """
+    key = (series_id, freq)
+    with _inflight_lock:
+        entry = _inflight.get(key)
+        shared = bool(entry and entry.start <= start and not entry.cancel.is_set())
+        if not shared:
+            entry = _inflight[key] = InflightFetch(start)
+        if not planned:
+            count_stat("fetch_calls")
+            count_stat("coalesced", entry.calls > 0)
+            entry.calls += 1
+        return not shared, entry
+
+
+def resolve_fetch(series_id, start, freq, entry):
+    """
+    claim_fetch 로 잡은 요청을 실제로 받아 entry.future 에 결과/오류 기록.
+    취소되면 coalescer 에서 빼서 이후 요청이 새로 받게 함
+    """
+    token = _current_fetch.set(entry)
+    cancel_token = _current_cancel.set(entry.cancel)
+    try:
+        check_cancelled()
+        dates, values = fetch_with_breaker(series_id, start, freq)
+        entry.future.set_result((to_dates(dates), values))
+    except FetchCancelled as e:
+        with _inflight_lock:
+            if _inflight.get((series_id, freq)) is entry:
+                del _inflight[(series_id, freq)]
+        entry.future.set_exception(e)
+    except Exception as e:
+        entry.future.set_exception(e)
+    finally:
+        _current_cancel.reset(cancel_token)
+        _current_fetch.reset(token)
+        entry.mark_sent()
+
+
+def fetch_with_breaker(series_id, start, freq):
+    """서킷 브레이커를 거쳐 시리즈 1개 가져오기 (성공/실패를 이번 실행 기록에 반영)"""
+    retries = breaker_retries(series_id)
+    try:
+        result = fetch_series(series_id, start, freq, retries)
+    except (DeadlineExceeded, FetchCancelled):
+        raise
+    except Exception:
+        if remaining_time() is not None and remaining_time() <= 0:
+            raise  # 제한 시간 때문에 잘린 요청은 시리즈 실패로 세지 않음
+        with _state_lock:
+            _run_failed.add(series_id)
+        raise
+    with _state_lock:
+        _run_succeeded.add(series_id)
+    return result
+
+
+def breaker_retries(series_id):
+    """
+    서킷 브레이커 상태에 따른 재시도 횟수.
+    BREAKER_THRESHOLD 회 연속 실행에서 실패한 시리즈는 쿨다운 동안 CircuitOpenError,
+    쿨다운이 지나면 재시도 없이 한 번만 시험 (성공하면 초기화)
+    """
+    with _state_lock:
+        entry = RUN_STATE.get("breaker", {}).get(series_id)
+    if not entry or entry["failures"] < BREAKER_THRESHOLD:
+        return FETCH_RETRIES
+    days = (date.fromisoformat(TODAY) - date.fromisoformat(entry["last_failure"])).days
+    if days < BREAKER_COOLDOWN_DAYS:
+        count_stat("breaker_skipped")
+        raise CircuitOpenError(f"{series_id}: {entry['failures']}회 연속 실패로 차단 중 (마지막 실패 {entry['last_failure']})")
+    return 0
+
+
+def update_breaker():
+    """이번 실행 결과를 서킷 브레이커 상태에 반영 (차단돼 건너뛴 시리즈는 그대로)"""
+    with _state_lock:
+        breaker = RUN_STATE.setdefault("breaker", {})
+        for series_id in _run_failed - _run_succeeded:
+            entry = breaker.setdefault(series_id, {"failures": 0})
+            entry["failures"] += 1
+            entry["last_failure"] = TODAY
+        for series_id in _run_succeeded:
+            breaker.pop(series_id, None)
+        _run_failed.clear()
+        _run_succeeded.clear()
+
+
+def save_state():
+    """실행 간 상태 파일 저장 (제한 시간과 무관하게 항상)"""
+    with _state_lock, open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(RUN_STATE, f, ensure_ascii=False, indent=2)
+
+
+def load_state():
+    """실행 간 상태 파일 읽기 (없거나 깨졌으면 빈 상태)"""
+    try:
+        with open(STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def call_with_retries(func, retries):
+    """일시적 오류면 지수 백오프 + 지터로 재시도, 그 외 오류는 바로 전달"""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            left = remaining_time()
+            if left is not None and delay >= left:
+                raise DeadlineExceeded(f"run deadline exceeded while retrying: {e}")
+            count_stat("retries")
+            print(f"  ↻ retry {attempt + 1}/{retries} in {delay:.1f}s: {e}")
+            time.sleep(delay)
+
+
+def is_transient(e):
+    """재시도하면 나아질 수 있는 오류인지 (연결·타임아웃·잘린 응답·5xx)"""
+    if isinstance(e, (requests.ConnectionError, requests.Timeout,
+                      requests.exceptions.ChunkedEncodingError, requests.JSONDecodeError)):
+        return True
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return e.response.status_code >= 500
+    return False
+
+
+def fred_request(series_id, start, freq, retries=0):
+    """
+    FRED observations 요청 1회 ('.' 결측치 제외).
+    디스크 캐시가 TTL 이내면 그대로 사용, 지났으면 ETag/Last-Modified 조건부 요청 → 304면 캐시 사용
+    """
+    cached = load_cache(series_id, start, freq) if CACHE_ENABLED else None
+    if cached and time.time() - cached["fetched_at"] < CACHE_TTL:
+        count_stat("cache_hits")
+        return cached["dates"], cached["values"]
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
     params = {
         "series_id": series_id,
         "api_key": FRED_KEY,
@@ -34,142 +391,1577 @@ def fred_fetch(series_id, start="2000-01-01", freq=None):
     }
     if freq:
         params["frequency"] = freq
-    r = requests.get(FRED_BASE, params=params, timeout=30)
-    r.raise_for_status()
-    obs = r.json().get("observations", [])
-    dates, values = [], []
-    for o in obs:
+
+    def attempt():
+        r = hedged_get(FRED_BASE, params, headers, parse=parse_observations)
+        if r.status_code == 304 and cached:
+            return r
+        r.raise_for_status()
+        return r
+
+    r = call_with_retries(attempt, retries)
+    if r.status_code == 304:
+        count_stat("cache_revalidated")
+        save_cache(series_id, start, freq, cached["dates"], cached["values"], cached.get("etag"), cached.get("last_modified"))
+        return cached["dates"], cached["values"]
+    dates, values = r.parsed
+    if CACHE_ENABLED:
+        save_cache(series_id, start, freq, dates, values, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    return dates, values
+
+
+def parse_observations(r):
+    """observations 응답 본문 → (dates, values array('d')), '.' 결측치 제외"""
+    if STREAM_PARSE:
+        return parse_observations_stream(r)
+    count_stat("bytes", len(r.content))
+    dates, values = [], array("d")
+    for o in r.json().get("observations", []):
         if o["value"] != ".":
             dates.append(o["date"])
             values.append(float(o["value"]))
     return dates, values
 
 
+_OBS_OBJECT_RE = re.compile(rb"\{[^{}]*\}")
+_OBS_DATE_RE = re.compile(rb'"date"\s*:\s*"([^"]*)"')
+_OBS_VALUE_RE = re.compile(rb'"value"\s*:\s*"([^"]*)"')
+
+
+def parse_observations_stream(r, chunk_size=64 * 1024):
+    """
+    응답을 청크 단위로 읽으며 관측치 객체 {...} 를 하나씩 추출 — 전체 JSON 트리/중간 리스트를 만들지 않음.
+    청크 경계에 걸친 객체는 다음 청크와 합쳐서 처리, '.' 는 읽는 즉시 버림
+    """
+    dates, values = [], array("d")
+    buf = b""
+    found = False
+    for chunk in r.iter_content(chunk_size):
+        check_deadline()
+        check_cancelled()
+        count_stat("bytes", len(chunk))
+        buf += chunk
+        found = found or b'"observations"' in buf
+        end = 0
+        for m in _OBS_OBJECT_RE.finditer(buf):
+            obj = m.group()
+            value = _OBS_VALUE_RE.search(obj)
+            if value and value.group(1) != b".":
+                dates.append(_OBS_DATE_RE.search(obj).group(1).decode())
+                values.append(float(value.group(1)))
+            end = m.end()
+        buf = buf[end:]
+    if not found:
+        raise ValueError("FRED 응답에 observations 가 없음")
+    return dates, values
+
+
+def hedge_threshold():
+    """헤지 기준 지연 = 이번 실행 observations 요청 지연의 p90 (표본 부족/비활성이면 None)"""
+    if not HEDGE_REQUESTS:
+        return None
+    with _stats_lock:
+        samples = sorted(_latencies)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return samples[min(len(samples) - 1, int(len(samples) * HEDGE_QUANTILE))]
+
+
+def hedged_get(url, params, headers=None, parse=None):
+    """
+    http_get + 꼬리 지연 헤지.
+    실제로 전송된 뒤 hedge_threshold() 안에 응답이 없으면 같은 요청을 하나 더 보내고 먼저 끝난 쪽을 사용.
+    레이트 리밋/슬롯 대기 시간은 세지 않음 — 대기열이 밀린 것을 느린 응답으로 오인해 요청을 늘리지 않게.
+    시도마다 CancelToken(요청 토큰의 하위)을 두고, 진 쪽은 취소해 슬롯/레이트 리밋을 바로 돌려줌
+    """
+    threshold = hedge_threshold()
+    if threshold is None:
+        return http_get(url, params, headers, parse)
+
+    pool = get_hedge_pool()
+    sent = threading.Event()
+    cancels = {}
+
+    def submit(*args):
+        # 헤지 스레드도 호출 쪽 요청의 전송 시각을 기록하도록 컨텍스트를 복사하고, 취소 토큰만 시도별로
+        context = contextvars.copy_context()
+        cancel = CancelToken(parent=_current_cancel.get())
+        context.run(_current_cancel.set, cancel)
+        future = pool.submit(context.run, http_get, url, params, headers, parse, *args)
+        cancels[future] = cancel
+        return future
+
+    primary = submit(sent.set)
+    while not sent.wait(0.05):
+        if primary.done():
+            return primary.result()
+    done, _ = wait([primary], timeout=threshold)
+    if done:
+        return primary.result()
+
+    count_stat("hedges_sent")
+    backup = submit()
+    pending = {primary, backup}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                r = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if future is backup:
+                count_stat("hedges_won")
+            for other in pending:
+                other.cancel()
+                cancels[other].set()
+            return r
+    raise error
+
+
+def get_hedge_pool():
+    global _hedge_pool
+    with _fetch_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=FETCH_JOBS * 2, thread_name_prefix="hedge")
+        return _hedge_pool
+
+
+def http_get(url, params, headers=None, parse=None, on_send=None):
+    """
+    레이트 리밋을 지키며 GET 1회.
+    레이트 리미터에서 차례를 받은 뒤 요청하고, 429면 Retry-After 동안 모든 요청을 멈춘 뒤 재시도.
+    parse 를 주면 200 응답 본문을 요청 슬롯 안에서 스트리밍으로 읽어 r.parsed 에 담음.
+    on_send 는 슬롯을 얻어 실제로 요청을 보내기 직전에 호출.
+    지금 시도(_current_cancel)가 취소되면 레이트 리밋 대기 중이든 전송 직전이든 FetchCancelled
+    """
+    entry = _current_fetch.get()
+    cancel = _current_cancel.get()
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        check_deadline()
+        check_cancelled()
+        waited = get_rate_limiter().acquire(max_wait=remaining_time(), cancel=cancel)
+        if waited is None:
+            check_cancelled()
+            raise DeadlineExceeded("run deadline exceeded while waiting for rate limit")
+        if waited > 0:
+            count_stat("rate_waits")
+            count_stat("rate_wait_s", waited)
+        with get_fetch_slots():
+            check_deadline()
+            check_cancelled()
+            if on_send is not None:
+                on_send()
+            if entry is not None:
+                entry.mark_sent()
+            sent = time.monotonic()
+            r = send_get(url, params, headers, stream=parse is not None)
+            if parse is not None:
+                r.parsed = parse(r) if r.status_code == 200 else None
+                r.close()
+                with _stats_lock:
+                    _latencies.append(time.monotonic() - sent)
+        count_stat("requests")
+        if r.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+            return r
+        count_stat("rate_limited")
+        get_rate_limiter().pause(retry_after_seconds(r))
+    return r
+
+
+def send_get(url, params, headers=None, stream=False):
+    """실제 GET (--replay 면 녹화본, --record 면 본문까지 읽어 녹화)"""
+    if REPLAY_DIR is not None:
+        return replay_get(url, params)
+    if RECORD_DIR is None:
+        return get_session().get(url, params=params, headers=headers, timeout=request_timeout(), stream=stream)
+    sent = time.monotonic()
+    r = get_session().get(url, params=params, headers=headers, timeout=request_timeout())
+    record_exchange(url, params, r, time.monotonic() - sent)
+    return r
+
+
+class ReplayMissError(requests.RequestException):
+    """녹화본에 없는 요청 (녹화 때와 다른 옵션/날짜로 재생)"""
+
+
+def exchange_key(url, params):
+    """녹화 키 — FRED_ROOT 기준 경로 + api_key 를 뺀 파라미터"""
+    path = url[len(FRED_ROOT):] if url.startswith(FRED_ROOT) else url
+    query = sorted((k, str(v)) for k, v in params.items() if k != "api_key")
+    return hashlib.sha1(json.dumps([path, query]).encode()).hexdigest()[:20]
+
+
+def next_exchange_path(directory, url, params):
+    """이 요청의 다음 녹화 파일 경로 (키별 순번)"""
+    key = exchange_key(url, params)
+    with _replay_lock:
+        n = _replay_counts[key]
+        _replay_counts[key] += 1
+    return directory / f"{key}-{n}.json"
+
+
+def record_exchange(url, params, r, latency):
+    """응답 1개 녹화 — 메타데이터 .json + 본문 .body (바이트 그대로)"""
+    path = next_exchange_path(RECORD_DIR, url, params)
+    # requests 가 이미 압축을 풀었으므로 전송 관련 헤더는 빼고 저장
+    headers = {k: v for k, v in r.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+    path.with_suffix(".body").write_bytes(r.content)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "url": url[len(FRED_ROOT):] if url.startswith(FRED_ROOT) else url,
+            "params": {k: v for k, v in params.items() if k != "api_key"},
+            "status": r.status_code,
+            "reason": r.reason,
+            "headers": headers,
+            "latency": latency,
+        }, f, ensure_ascii=False, indent=2)
+    count_stat("recorded")
+
+
+def replay_get(url, params):
+    """녹화된 응답으로 requests.Response 구성, 녹화 때 지연만큼 대기. 같은 요청이 녹화보다 많으면 마지막 응답 반복"""
+    path = next_exchange_path(REPLAY_DIR, url, params)
+    if not path.exists():
+        key, n = path.stem.rsplit("-", 1)
+        earlier = [REPLAY_DIR / f"{key}-{i}.json" for i in range(int(n) - 1, -1, -1)]
+        path = next((p for p in earlier if p.exists()), None)
+        if path is None:
+            raise ReplayMissError(f"no recording for {url} {params.get('series_id') or params.get('release_id') or ''}".rstrip())
+    with open(path, encoding="utf-8") as f:
+        entry = json.load(f)
+    body = path.with_suffix(".body").read_bytes()
+    if REPLAY_SPEED > 0:
+        time.sleep(entry["latency"] * REPLAY_SPEED)
+
+    r = requests.Response()
+    r.status_code = entry["status"]
+    r.reason = entry.get("reason")
+    r.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    r.request = requests.Request("GET", url, params=params).prepare()
+    r.url = r.request.url
+    r.elapsed = timedelta(seconds=entry["latency"])
+    r._content = body
+    r._content_consumed = True
+    count_stat("replayed")
+    return r
+
+
+def request_timeout():
+    """(연결, 읽기) 타임아웃 — 실행 제한 시간까지 남은 시간을 넘지 않게"""
+    left = remaining_time()
+    if left is None:
+        return FRED_TIMEOUT
+    return tuple(max(0.1, min(t, left)) for t in FRED_TIMEOUT)
+
+
+def retry_after_seconds(r, default=30):
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 초"""
+    value = r.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now().astimezone()).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """
+    스레드 공유 슬라이딩 윈도우 레이트 리미터.
+    최근 60초 안의 전송 시각을 기억해 어떤 60초 구간에서도 per_minute 개를 넘지 않게 함 —
+    한도까지는 바로 보내고, 찼으면 가장 오래된 전송이 창을 벗어날 때까지 대기 (한도 전체를 씀)
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self, per_minute):
+        self.limit = max(1, per_minute)
+        self.sent = deque()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _ready_at(self, now):
+        """다음 전송이 가능한 시각 (lock 안에서 호출)"""
+        while self.sent and self.sent[0] <= now - self.WINDOW:
+            self.sent.popleft()
+        ready = self.blocked_until
+        if len(self.sent) >= self.limit:
+            ready = max(ready, self.sent[0] + self.WINDOW)
+        return ready
+
+    def acquire(self, max_wait=None, cancel=None):
+        """
+        전송 1건 자리를 얻을 때까지 대기. Returns: 대기한 초
+        max_wait 보다 오래 기다려야 하거나 기다리는 중 cancel(CancelToken)이 설정되면 자리를 잡지 않고 None
+        """
+        started = time.monotonic()
+        waited = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                ready = self._ready_at(now)
+                if ready <= now:
+                    self.sent.append(now)
+                    return now - started if waited else 0.0
+            if max_wait is not None and ready - started > max_wait:
+                return None
+            waited = True
+            # 깨어난 뒤 다시 확인 — 그 사이 다른 스레드가 자리를 가져갔을 수 있음
+            if cancel is None:
+                time.sleep(ready - now)
+            elif cancel.wait(ready - now):
+                return None
+
+    def pause(self, seconds):
+        """429 Retry-After — 모든 요청을 seconds 동안 멈춤"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def get_rate_limiter():
+    """실행 전체가 공유하는 FRED 레이트 리미터"""
+    global _rate_limiter
+    with _fetch_pool_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(FRED_RATE_LIMIT)
+        return _rate_limiter
+
+
+def cache_path(series_id, start, freq):
+    return CACHE_DIR / f"{series_id}_{start}_{freq or 'native'}.json"
+
+
+def load_cache(series_id, start, freq):
+    """캐시된 응답 (없거나 깨졌으면 None)"""
+    try:
+        with open(cache_path(series_id, start, freq), encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    cached["values"] = array("d", cached["values"])
+    return cached
+
+
+def save_cache(series_id, start, freq, dates, values, etag=None, last_modified=None):
+    """관측치 + 검증 헤더 + 받은 시각 저장 (임시 파일 → rename 으로 원자적 교체)"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = cache_path(series_id, start, freq)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "dates": dates,
+            "values": list(values),
+        }, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def raw_path(series_id, freq):
+    return RAW_DIR / f"{series_id}_{freq or 'native'}.json"
+
+
+def load_raw(series_id, freq):
+    """저장된 원본 관측치 (없으면 None)"""
+    path = raw_path(series_id, freq)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        stored = json.load(f)
+    stored["values"] = array("d", stored["values"])
+    return stored
+
+
+def save_raw(series_id, freq, start, dates, values, last_updated=None):
+    """원본 관측치 저장 — start: 이 데이터가 커버하는 시작일, last_updated: FRED 메타데이터 값"""
+    RAW_DIR.mkdir(exist_ok=True)
+    with open(raw_path(series_id, freq), "w", encoding="utf-8") as f:
+        json.dump({
+            "series_id": series_id,
+            "freq": freq,
+            "start": start,
+            "fetched": TODAY,
+            "last_updated": last_updated,
+            "dates": dates,
+            "values": list(values),
+        }, f, separators=(",", ":"))
+
+
+def period_start(day, freq):
+    """주기 집계(m/q/a) 시작일로 내림 — 부분 기간 평균이 섞이지 않게"""
+    if freq == "m":
+        return day.replace(day=1)
+    if freq == "q":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    if freq == "a":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def fetch_series(series_id, start, freq, retries=0):
+    """
+    data/raw 저장소를 활용해 관측치 확보.
+      - --skip-unchanged: FRED 메타데이터 last_updated 가 저장본과 같으면 요청 없이 저장본 사용
+        (계획된 시리즈는 plan_fetches 가 미리 조회해 둔 값, 대체 시리즈만 여기서 조회)
+      - --incremental: 저장본의 마지막 관측일 - REVISION_DAYS 부터만 받아서 꼬리 부분 병합
+    저장본이 없거나 요청 시작일을 커버하지 못하면 전체 다운로드.
+    """
+    if not (INCREMENTAL or SKIP_UNCHANGED):
+        return fred_request(series_id, start, freq, retries)
+
+    stored = load_raw(series_id, freq)
+    usable = stored and stored["dates"] and stored["start"] <= start
+    last_updated = series_last_updated(series_id) if SKIP_UNCHANGED else None
+
+    if usable and last_updated and stored.get("last_updated") == last_updated:
+        count_stat("unchanged")
+        dates, values = stored["dates"], stored["values"]
+        record_change(series_id, freq, None)
+    elif usable and INCREMENTAL:
+        dates, values = fetch_tail(series_id, freq, stored, retries)
+        save_raw(series_id, freq, stored["start"], dates, values, last_updated)
+        record_change(series_id, freq, first_change(stored["dates"], stored["values"], dates, values))
+    else:
+        dates, values = fred_request(series_id, start, freq, retries)
+        save_raw(series_id, freq, start, dates, values, last_updated)
+        record_change(series_id, freq, "")
+
+    i = bisect_left(dates, start)
+    return dates[i:], values[i:]
+
+
+def fetch_tail(series_id, freq, stored, retries=0):
+    """저장본 꼬리(마지막 관측일 - REVISION_DAYS 이후)만 다시 받아 병합한 전체 관측치"""
+    last = date.fromisoformat(stored["dates"][-1])
+    tail_start = period_start(last - timedelta(days=REVISION_DAYS), freq).isoformat()
+    tail_start = max(tail_start, stored["start"])
+    t_dates, t_values = fred_request(series_id, tail_start, freq, retries)
+    count_stat("incremental")
+
+    if not t_dates:
+        # 꼬리 구간이 비어 오면 저장본 유지 (일시적 응답 이상으로 과거 데이터를 잃지 않게)
+        return stored["dates"], stored["values"]
+    keep = bisect_left(stored["dates"], tail_start)
+    return stored["dates"][:keep] + t_dates, stored["values"][:keep] + t_values
+
+
+def first_change(old_dates, old_values, new_dates, new_values):
+    """두 관측치 목록이 처음 달라지는 날짜 (같으면 None)"""
+    for old_date, new_date, old_value, new_value in zip(old_dates, new_dates, old_values, new_values):
+        if old_date != new_date or old_value != new_value:
+            return min(old_date, new_date)
+    if len(old_dates) == len(new_dates):
+        return None
+    return (old_dates if len(old_dates) > len(new_dates) else new_dates)[min(len(old_dates), len(new_dates))]
+
+
+def record_change(series_id, freq, since):
+    """시리즈의 변경 시작일 기록 — 같은 실행에서 여러 번 받으면 가장 이른 변경을 유지"""
+    with _state_lock:
+        key = (series_id, freq)
+        if key in _raw_changes and (since is None or (_raw_changes[key] is not None and _raw_changes[key] < since)):
+            return
+        _raw_changes[key] = since
+
+
+def series_last_updated(series_id):
+    """
+    FRED 시리즈 메타데이터의 last_updated (실행당 시리즈별 1회 조회).
+    조회 실패 시 None — 호출 쪽은 평소처럼 다운로드.
+    fred/series/updates 는 최근 2주 동안 갱신된 FRED 전체 시리즈를 페이지 단위로 나열하므로
+    수십 개 시리즈 확인에는 시리즈별 fred/series 조회가 요청 수가 더 적음
+    """
+    with _state_lock:
+        if series_id in _series_meta:
+            return _series_meta[series_id]
+    try:
+        r = http_get(FRED_SERIES_URL, {"series_id": series_id, "api_key": FRED_KEY, "file_type": "json"})
+        r.raise_for_status()
+        seriess = r.json().get("seriess", [])
+        last_updated = seriess[0].get("last_updated") if seriess else None
+        count_stat("meta_requests")
+    except Exception as e:
+        print(f"  ⚠️ {series_id} metadata fetch failed: {e}")
+        last_updated = None
+    with _state_lock:
+        _series_meta[series_id] = last_updated
+    return last_updated
+
+
+def get_fetch_pool():
+    """FRED 요청 공유 스레드 풀 (FETCH_JOBS 크기)"""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_JOBS, thread_name_prefix="fred")
+        return _fetch_pool
+
+
+def get_fetch_slots():
+    """동시 HTTP 요청 슬롯 — 태스크 스레드에서 직접 부른 fred_fetch도 함께 제한"""
+    global _fetch_slots
+    with _fetch_pool_lock:
+        if _fetch_slots is None:
+            _fetch_slots = threading.BoundedSemaphore(FETCH_JOBS)
+        return _fetch_slots
+
+
+def get_session():
+    """
+    모든 fetch_*가 공유하는 HTTP 세션.
+    커넥션 풀을 FETCH_JOBS 크기로 잡아 keep-alive 연결을 재사용 (요청마다 TCP+TLS 핸드셰이크 방지)
+    """
+    global _session
+    with _fetch_pool_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=FETCH_JOBS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+            _session = session
+        return _session
+
+
+def session_stats():
+    """
+    공유 세션의 커넥션 재사용 통계.
+    Returns: {"requests": 요청 수, "connections": 새로 연 연결 수, "reused": 재사용된 요청 수}
+    """
+    requests_made = connections = 0
+    if _session is not None:
+        for adapter in {id(a): a for a in _session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+    return {"requests": requests_made, "connections": connections, "reused": requests_made - connections}
+
+
+class FallbackChain:
+    """
+    대체 시리즈 체인 상태 (fred_fetch_first / fred_fetch_first_async 공용).
+    후보 요청 띄우기, 다음에 기다릴 대상과 제한 시간, 끝난 결과 판정을 맡고 기다리는 방식(스레드/asyncio)은 호출 쪽이 정함
+    """
+
+    def __init__(self, candidates, accept=None, hedge_delay=None):
+        self.candidates = candidates
+        self.accept = accept
+        self.hedge_delay = FALLBACK_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        self.index = {}    # 결과 Future → 후보 index
+        self.owned = []    # 이 체인이 직접 채우는 요청 (다른 후보가 이기면 취소)
+        self.pending = set()
+        self.last_error = None
+        self.latest = self.launch()
+
+    def launch(self):
+        """다음 후보 요청 (이미 진행 중인 같은 시리즈 요청이 있으면 공유)"""
+        i = len(self.index)
+        owner, entry = claim_fetch(*self.candidates[i])
+        if owner:
+            get_fetch_pool().submit(resolve_fetch, *self.candidates[i], entry)
+            self.owned.append(entry)
+        self.index[entry.future] = i
+        self.pending.add(entry.future)
+        if i > 0:
+            count_stat("fallback_launched")
+        return entry
+
+    def waiting(self):
+        """기다릴 Future 들과 제한 시간 (다음 후보가 남았으면 최근 후보가 실제로 전송된 뒤 hedge_delay 까지)"""
+        if len(self.index) == len(self.candidates):
+            return self.pending, None
+        if self.latest.sent.done():
+            return self.pending, max(0.0, self.latest.sent.result() + self.hedge_delay - time.monotonic())
+        return self.pending | {self.latest.sent}, None  # 아직 대기열 — 전송되면 그때부터 hedge_delay
+
+    def settle(self, done):
+        """
+        끝난 Future 판정 (done 이 비었으면 제한 시간 경과).
+        Returns: 채택한 (후보 index, dates, values) 또는 None — 실패/기준 미달/시간 초과면 다음 후보를 띄우고 계속
+        """
+        more = len(self.index) < len(self.candidates)
+        failed = False
+        for future in sorted(done & self.pending, key=self.index.get):  # 동시에 끝났으면 우선순위 높은 쪽
+            self.pending.discard(future)
+            series_id, start, _ = self.candidates[self.index[future]]
+            try:
+                dates, values = since_start(*future.result(), start)
+            except Exception as e:
+                print(f"  ⚠️ {series_id} failed: {e}")
+                self.last_error, failed = e, True
+                continue
+            if self.accept is None or self.accept(dates, values):
+                for entry in self.owned:
+                    if entry.future is not future:
+                        entry.cancel.set()
+                if self.index[future] > 0:
+                    count_stat("fallback_used")
+                return self.index[future], dates, values
+            print(f"  ⚠️ {series_id}: 데이터 부족 ({len(dates)} pts)")
+            self.last_error, failed = ValueError(f"{series_id}: not enough data"), True
+        if more and (failed or not done):
+            self.latest = self.launch()
+        return None
+
+
+def fred_fetch_first(candidates, accept=None, hedge_delay=None):
+    """
+    대체 시리즈 체인을 헤지 요청으로 실행.
+    1순위를 먼저 요청하고, 실제로 전송된 뒤 hedge_delay 초 안에 끝나지 않거나 실패/기준 미달이면 다음 후보를 추가로 요청
+    (레이트 리밋/슬롯 대기열에 머문 시간은 세지 않음 — 밀린 대기열을 느린 응답으로 오인하지 않게).
+    먼저 도착한 유효한 결과(accept(dates, values) 통과)를 쓰고, 이 체인이 띄운 나머지 요청은 취소 (FetchCancelled).
+    candidates: [(series_id, start, freq), ...]  →  Returns: (후보 index, dates, values)
+    모든 후보가 실패하면 마지막 오류를 그대로 raise
+    """
+    chain = FallbackChain(candidates, accept, hedge_delay)
+    while chain.pending:
+        futures, timeout = chain.waiting()
+        done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        result = chain.settle(done)
+        if result is not None:
+            return result
+    raise chain.last_error
+
+
+def done_signal(future, loop):
+    """
+    concurrent Future 가 끝나면 완료되는 asyncio Future (결과/오류는 담지 않음 — 원본 Future 에서 읽음).
+    wrap_future 와 달리 기다리다 그만둬도 원본(공유 요청)을 취소하지 않고, 읽지 않은 오류 경고도 남기지 않음
+    """
+    signal = loop.create_future()
+
+    def notify(_):
+        try:
+            loop.call_soon_threadsafe(lambda: signal.done() or signal.set_result(None))
+        except RuntimeError:
+            pass  # 루프가 이미 닫힘 — 기다리는 쪽이 없음
+    future.add_done_callback(notify)
+    return signal
+
+
+async def fred_fetch_async(series_id, start="2000-01-01", freq=None):
+    """
+    fred_fetch 의 awaitable 버전 — coalescer/서킷 브레이커/캐시는 동기 경로와 공유.
+    HTTP 는 fetch 풀 스레드가 보내고, 결과를 기다리는 동안에는 스레드를 잡지 않음
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        owner, entry = claim_fetch(series_id, start, freq)
+        if owner:
+            get_fetch_pool().submit(resolve_fetch, series_id, start, freq, entry)
+        await done_signal(entry.future, loop)
+        try:
+            return since_start(*entry.future.result(), start)
+        except FetchCancelled:
+            continue  # 공유하던 대체 후보 요청이 취소됨 — 새로 요청
+
+
+async def fred_fetch_first_async(candidates, accept=None, hedge_delay=None):
+    """fred_fetch_first 의 awaitable 버전 — 후보 요청은 fetch 풀이 받고 hedge_delay 대기는 이벤트 루프에서"""
+    loop = asyncio.get_running_loop()
+    chain = FallbackChain(candidates, accept, hedge_delay)
+    while chain.pending:
+        futures, timeout = chain.waiting()
+        signals = {done_signal(future, loop): future for future in futures}
+        done, _ = await asyncio.wait(signals, timeout=timeout, return_when=FIRST_COMPLETED)
+        result = chain.settle({signals[signal] for signal in done})
+        if result is not None:
+            return result
+    raise chain.last_error
+
+
+def close_fetch_engine():
+    """
+    풀/세션 정리 — 같은 프로세스에서 다시 실행할 수 있도록 초기화.
+    남은 요청(쓰이지 않은 대체 후보 등)은 취소하고, 풀 종료는 _fetch_pool_lock 밖에서 기다림 —
+    종료를 기다리는 작업이 get_session()/get_rate_limiter() 로 같은 잠금을 잡아도 막히지 않게
+    """
+    global _fetch_pool, _hedge_pool, _fetch_slots, _session, _rate_limiter
+    with _inflight_lock:
+        for entry in _inflight.values():
+            entry.cancel.set()
+        _inflight.clear()
+    with _fetch_pool_lock:
+        fetch_pool, hedge_pool = _fetch_pool, _hedge_pool
+    if hedge_pool is not None:
+        hedge_pool.shutdown(wait=False, cancel_futures=True)
+    if fetch_pool is not None:
+        fetch_pool.shutdown()
+    with _fetch_pool_lock:
+        if _session is not None:
+            _session.close()
+        _fetch_pool = _hedge_pool = _fetch_slots = _session = _rate_limiter = None
+
+
 def save_json(filename, data):
-    """JSON 파일 저장"""
+    """JSON 파일 저장 (실행 제한 시간이 지났으면 저장하지 않음 — 잘린 데이터 게시 방지)"""
+    check_deadline()
     path = DATA_DIR / filename
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     print(f"  ✅ {filename} saved ({len(json.dumps(data))} bytes)")
 
 
-def calc_yoy_from_index(dates, values):
+# 날짜는 fred_fetch 이후 NumPy datetime64 배열(정수 서수 + 단위 태그 D/M/Y)로 다루고 저장할 때만 문자열로 바꿈
+
+def to_dates(dates):
+    """날짜 문자열("YYYY-MM-DD"/"YYYY-MM") 또는 datetime64 → 일 단위 datetime64[D] 배열"""
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+def to_months(dates):
+    """날짜 → 월 단위 datetime64[M] 배열 (같은 달이면 같은 값)"""
+    return to_dates(dates).astype("datetime64[M]")
+
+
+def format_dates(dates):
+    """datetime64 배열 → 문자열 리스트 (단위 그대로: D "YYYY-MM-DD", M "YYYY-MM", Y "YYYY")"""
+    return np.datetime_as_string(np.asarray(dates)).tolist()
+
+
+def yoy_by_month(dates, values, decimals=1):
     """
-    월간 지수 데이터에서 YoY % 변화율 계산.
-    YYYY-MM 월 기준으로 매칭하여 정확한 날짜 형식에 의존하지 않음.
-    Returns: (yoy_dates, yoy_values)  — yoy_dates는 YYYY-MM 형식
+    월간 지수 → 전년 동월 대비 % (NumPy).
+    월 단위 서수로 빈 달 없는 배열을 만들고 12칸 시프트 한 번으로 계산 — 빠진 달(공백)은 NaN 이라 자동 제외.
+    같은 월이 여러 번이면 현재값은 그 달 첫 관측, 기준값은 마지막 관측.
+    12개월 전 값이 없거나 0이면 제외.
+    Returns: (months datetime64[M] 배열, yoy 리스트 — decimals 자리 반올림)
     """
-    # 월(YYYY-MM) -> 값 매핑 (같은 월 여러 값이면 마지막 값 사용)
-    month_val = {}
-    for d, v in zip(dates, values):
-        ym = d[:7]  # "2024-01-01" -> "2024-01"
-        month_val[ym] = v
+    if len(dates) == 0:
+        return np.empty(0, dtype="datetime64[M]"), []
+    months = to_months(dates)
+    vals = np.asarray(values, dtype=np.float64)
+    base = months.min()
+    pos = (months - base).astype(np.int64)
+    span = int(pos.max()) + 1
+
+    first = np.full(span, np.nan)
+    last = np.full(span, np.nan)
+    slots, idx = np.unique(pos, return_index=True)
+    first[slots] = vals[idx]
+    slots, idx = np.unique(pos[::-1], return_index=True)
+    last[slots] = vals[len(vals) - 1 - idx]
+
+    prev = np.full(span, np.nan)
+    prev[12:] = last[:-12]
+    valid = ~np.isnan(first) & ~np.isnan(prev) & (prev != 0)
+    cur, base_vals = first[valid], prev[valid]
+    yoy = ((cur - base_vals) / base_vals) * 100
+    # 반올림은 파이썬 round 로 (np.round 는 .x5 경계에서 결과가 다를 수 있음)
+    return base + np.flatnonzero(valid), [round(x, decimals) for x in yoy.tolist()]
+
+
+def merge_dates(date_arrays):
+    """
+    오름차순 날짜 배열 여러 개 → 중복 없는 오름차순 합집합.
+    이어 붙인 뒤 안정 정렬(timsort — 이미 정렬된 구간을 병합하므로 k-way 병합과 같은 O(N log k)) 후 인접 중복 제거
+    """
+    if not date_arrays:
+        return np.empty(0, dtype="datetime64[D]")
+    merged = np.sort(np.concatenate(date_arrays), kind="stable")
+    keep = np.ones(len(merged), dtype=bool)
+    keep[1:] = merged[1:] != merged[:-1]
+    return merged[keep]
 
-    yoy_dates = []
-    yoy_values = []
-    seen_months = set()
 
-    for d, v in zip(dates, values):
-        ym = d[:7]
-        if ym in seen_months:
+def align_series(series, seed=0, max_gap=None, leading="seed"):
+    """
+    여러 시리즈를 공통 날짜축에 맞추고 forward fill (시리즈당 벡터 연산 몇 번, 날짜별 dict 조회 없음).
+    series: {key: (dates, values)} — dates 는 오름차순 (같은 날짜가 여러 번이면 마지막 값)
+    seed: 첫 관측 전 채울 값
+    max_gap: 마지막 관측에서 이 칸 수를 넘게 떨어진 날짜는 None (기본: 무제한 채움)
+    leading: 첫 관측 전 처리 — "seed" (seed 값) / "backfill" (첫 관측값) / "none" (None)
+    값은 그대로 옮김 (int/float 타입 유지).
+    Returns: (dates 배열 — 저장할 때 format_dates, {key: values 리스트})
+    """
+    date_arrays = {key: np.asarray(dates) for key, (dates, _) in series.items()}
+    axis = merge_dates([arr for arr in date_arrays.values() if len(arr)])
+    size = len(axis)
+    positions = np.arange(size)
+    aligned = {}
+    for key, (_, values) in series.items():
+        dates = date_arrays[key]
+        n = len(dates)
+        if n == 0:
+            aligned[key] = [seed if leading == "seed" else None] * size
             continue
+        # 값 풀 끝에 [seed, None] — 인덱스 -2 / -1 로 참조
+        pool = np.empty(n + 2, dtype=object)
+        pool[:n] = list(values)
+        pool[n:] = [seed, None]
+        last = np.ones(n, dtype=bool)
+        last[:-1] = dates[1:] != dates[:-1]  # 같은 날짜는 마지막 것만
+        value_idx = np.flatnonzero(last)
+        obs_pos = np.searchsorted(axis, dates[last])
+
+        # 각 날짜에서 가장 최근 관측의 (값 인덱스, 축 위치) — 누적 최대값으로 forward fill
+        src = np.full(size, -1)
+        src[obs_pos] = value_idx
+        src = np.maximum.accumulate(src)
+        before = src < 0
+        src[before] = {"seed": -2, "backfill": value_idx[0], "none": -1}[leading]
+        if max_gap is not None:
+            seen = np.full(size, -1)
+            seen[obs_pos] = obs_pos
+            seen = np.maximum.accumulate(seen)
+            src[~before & (positions - seen > max_gap)] = -1
+        aligned[key] = pool[src].tolist()
+    return axis, aligned
+
+
+def segment_sums(vals, starts, counts):
+    """
+    구간 합 — 구간마다 왼쪽부터 차례로 더함 (파이썬 sum 과 같은 결과).
+    np.add.reduceat 은 쌍별 합산이라 마지막 비트가 달라 round(.., 2) 경계에서 값이 바뀔 수 있음.
+    반복은 가장 긴 구간 길이만큼, 각 반복은 모든 구간에 대한 벡터 연산
+    """
+    out = np.zeros(len(starts))
+    for k in range(int(counts.max())):
+        live = np.flatnonzero(counts > k)
+        out[live] += vals[starts[live] + k]
+    return out
 
-        # 12개월 전 월 계산
-        year = int(ym[:4])
-        month = int(ym[5:7])
-        prev_year = year - 1
-        prev_ym = f"{prev_year}-{month:02d}"
 
-        if prev_ym in month_val and month_val[prev_ym] != 0:
-            yoy = round(((v - month_val[prev_ym]) / month_val[prev_ym]) * 100, 1)
-            yoy_dates.append(ym)
-            yoy_values.append(yoy)
-            seen_months.add(ym)
+def period_labels(dates, freq):
+    """
+    날짜 → 속한 달력 기간 라벨.
+    "w": 그 주 금요일 (FRED 주간과 같은 금요일 마감, datetime64[D]) / "m": 월 / "q": 분기 첫 달 (datetime64[M]) / "a": 연 (datetime64[Y])
+    """
+    days = to_dates(dates)
+    if freq == "w":
+        weekday = (days.astype(np.int64) + 3) % 7  # 월=0 (1970-01-01 은 목요일)
+        return days + (4 - weekday) % 7
+    if freq == "m":
+        return days.astype("datetime64[M]")
+    if freq == "q":
+        months = days.astype("datetime64[M]")
+        return months - months.astype(np.int64) % 3
+    if freq == "a":
+        return days.astype("datetime64[Y]")
+    raise ValueError(f"unknown resample freq: {freq}")
+
+
+def resample(dates, values, freq="m", how="mean", busday=False):
+    """
+    정렬된 시계열을 달력 기간별로 집계 — 기간 경계를 한 번 찾고 구간 리듀스 (관측치별 파이썬 루프 없음).
+    freq: "w" / "m" / "q" / "a" (period_labels 참고)
+    how: "mean" / "first" / "last" / "min" / "max" / "sum" / "count"
+    busday: True 면 주말 관측치는 빼고 집계. NaN 은 항상 제외
+    Returns: (기간 라벨 datetime64 배열, float64 배열)
+    """
+    days = to_dates(dates)
+    vals = np.asarray(values, dtype=np.float64)
+    keep = ~np.isnan(vals)
+    if busday:
+        keep &= np.is_busday(days)
+    days, vals = days[keep], vals[keep]
+    labels = period_labels(days, freq)
+    if len(labels) == 0:
+        return labels, vals
+
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    counts = np.diff(np.r_[starts, len(vals)])
+    if how == "first":
+        out = vals[starts]
+    elif how == "last":
+        out = vals[starts + counts - 1]
+    elif how == "count":
+        out = counts.astype(np.float64)
+    elif how == "mean":
+        out = segment_sums(vals, starts, counts) / counts
+    elif how == "sum":
+        out = segment_sums(vals, starts, counts)
+    elif how == "min":
+        out = np.minimum.reduceat(vals, starts)
+    elif how == "max":
+        out = np.maximum.reduceat(vals, starts)
+    else:
+        raise ValueError(f"unknown resample method: {how}")
+    return labels[starts], out
 
-    return yoy_dates, yoy_values
+
+# ═══════════════════════════════════════
+# ROLLING STATISTICS (z-score, 백분위)
+# ═══════════════════════════════════════
+ZSCORE_YEARS = 10  # 지표 카드 z-score 후행 창 (년)
+
+
+def window_starts(dates, years):
+    """
+    각 날짜의 후행 창 (t - years년, t] 시작 인덱스 — 달력 기준이라 주기(일/주/월/연)와 무관.
+    월간 1일 관측이면 10년 = 정확히 120개
+    """
+    days = to_dates(dates)
+    months = days.astype("datetime64[M]")
+    bound = (months - 12 * years).astype("datetime64[D]") + (days - months.astype("datetime64[D]"))
+    return np.searchsorted(days, bound, side="right")
+
+
+def rolling_zscore(dates, values, years=ZSCORE_YEARS, min_points=3):
+    """
+    후행 years 년 창 z-score (모집단 표준편차).
+    Σx, Σx² 누적합의 차분으로 창마다 평균/분산을 O(1) 에 구해 전체 O(n) — 창을 매번 다시 더하지 않음.
+    누적 제곱합의 상쇄 오차를 줄이려고 전체 평균을 뺀 값으로 누적.
+    창 관측치가 min_points 미만이거나 창 안 값이 모두 같으면 NaN
+    Returns: float64 배열
+    """
+    x = np.asarray(values, dtype=np.float64)
+    if len(x) == 0:
+        return x
+    x = x - x.mean()
+    sums = np.r_[0.0, np.cumsum(x)]
+    squares = np.r_[0.0, np.cumsum(x * x)]
+    start = window_starts(dates, years)
+    end = np.arange(1, len(x) + 1)
+    count = end - start
+    mean = (sums[end] - sums[start]) / count
+    std = np.sqrt(np.maximum((squares[end] - squares[start]) / count - mean * mean, 0.0))
+    flat = std <= 1e-9 * max(1.0, float(np.abs(x).max()))  # 상수 구간은 오차만 남으므로 0으로 봄
+    z = np.full(len(x), np.nan)
+    ok = (count >= min_points) & ~flat
+    z[ok] = (x[ok] - mean[ok]) / std[ok]
+    return z
+
+
+class RankTree:
+    """값 순위별 개수를 담는 Fenwick 트리 — 추가/삭제, 순위 이하 개수 모두 O(log n)"""
+
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, rank, delta=1):
+        i = rank + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def count_le(self, rank):
+        """rank 이하 순위의 개수"""
+        i, total = rank + 1, 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+def rolling_percentile(dates, values, years=None):
+    """
+    백분위 순위 — 창 안 관측치 중 현재값 이하인 비율(%). years=None 이면 처음부터 전체 (확장 창).
+    값을 순위로 압축해 RankTree 에 넣고(창을 벗어난 값은 빼고) 순위 이하 개수를 셈 → 전체 O(n log n)
+    Returns: float64 배열
+    """
+    vals = np.asarray(values, dtype=np.float64)
+    n = len(vals)
+    if n == 0:
+        return vals
+    ranks = np.unique(vals, return_inverse=True)[1].ravel().tolist()
+    starts = [0] * n if years is None else window_starts(dates, years).tolist()
+    tree = RankTree(max(ranks) + 1)
+    out = np.empty(n)
+    left = 0
+    for i, rank in enumerate(ranks):
+        tree.add(rank)
+        while left < starts[i]:
+            tree.add(ranks[left], -1)
+            left += 1
+        out[i] = tree.count_le(rank) / (i - left + 1) * 100
+    return out
+
+
+def card_stats(dates, values):
+    """
+    지표 카드용 최신 통계 — 10년 z-score + 전체 기간 백분위.
+    Returns: {"zscore_10y": float 또는 None, "percentile": float 또는 None}
+    """
+    if len(values) == 0:
+        return {"zscore_10y": None, "percentile": None}
+    z = rolling_zscore(dates, values)[-1]
+    pct = rolling_percentile(dates, values)[-1]
+    return {"zscore_10y": None if np.isnan(z) else round(float(z), 2), "percentile": round(float(pct), 1)}
+
+
+# ═══════════════════════════════════════
+# SERIES REGISTRY
+# ═══════════════════════════════════════
+# 태스크별 FRED 시리즈 선언 — id/start/freq 는 요청, 나머지(name, flag ...)는 출력용 메타데이터.
+# fallbacks: 1순위가 실패/지연/데이터 부족이면 차례로 헤지 요청할 대체 시리즈
+# accept: 체인 결과를 받아들일 최소 조건 (min_points 관측치 수, min_last 마지막 관측일)
+SERIES_REGISTRY = {
+    "Global M2": {
+        "total": {"id": "M2SL", "start": "2015-01-01", "freq": "m"},
+        # --- 국가별: YoY % 성장률 (새 OECD 시리즈, 2025년까지 업데이트) ---
+        # 기존 MABMM301*M189S 시리즈는 2023년에 단종됨
+        # 새 시리즈: {COUNTRY}MABMM301GYSAM = Growth rate YoY, Seasonally Adjusted, Monthly
+        "us": {"id": "USAMABMM301GYSAM", "start": "2015-01-01", "freq": "m", "name": "미국", "flag": "🇺🇸"},
+        "eu": {"id": "EA19MABMM301GYSAM", "start": "2015-01-01", "freq": "m", "name": "유로존", "flag": "🇪🇺"},
+        "jp": {"id": "JPNMABMM301GYSAM", "start": "2015-01-01", "freq": "m", "name": "일본", "flag": "🇯🇵"},
+        "kr": {"id": "KORMABMM301GYSAM", "start": "2015-01-01", "freq": "m", "name": "한국", "flag": "🇰🇷",
+               # 2015년 이후 YoY를 만들 수 있는 첫 결과 사용
+               "accept": {"min_points": 13, "min_last": "2015-01-01"},
+               # KR M3 growth가 없을 경우 대체 시리즈 (레벨 → 수동 YoY 계산, div 로 나눔)
+               "fallbacks": [
+                   {"id": "MYAGM2KRM189S", "start": "2014-01-01", "freq": "m", "div": 1},    # IMF M2 for Korea (national currency)
+                   {"id": "MABMM301KRM189S", "start": "2014-01-01", "freq": "m", "div": 1},  # OECD M3 old format (단종됐지만 과거 데이터용)
+               ]},
+    },
+    "Fed Balance Sheet": {
+        "total": {"id": "WALCL", "start": "2008-01-01", "freq": "w"},
+    },
+    "Yield Curve": {
+        label: {"id": sid, "start": "2023-01-01", "freq": None}
+        for label, sid in {
+            "1M": "DGS1MO", "3M": "DGS3MO", "6M": "DGS6MO",
+            "1Y": "DGS1", "2Y": "DGS2", "3Y": "DGS3",
+            "5Y": "DGS5", "7Y": "DGS7", "10Y": "DGS10",
+            "20Y": "DGS20", "30Y": "DGS30",
+        }.items()
+    },
+    "NFCI": {
+        "nfci": {"id": "NFCI", "start": "2000-01-01", "freq": "w"},
+    },
+    "Interest Rates": {
+        "us": {"id": "DFEDTARU", "start": "2000-01-01", "freq": "m", "name": "미국", "flag": "🇺🇸", "bank": "Fed"},
+        "kr": {"id": "IRSTCI01KRM156N", "start": "2000-01-01", "freq": "m", "name": "한국", "flag": "🇰🇷", "bank": "BOK"},
+        "eu": {"id": "ECBMRRFR", "start": "2000-01-01", "freq": "m", "name": "유로존", "flag": "🇪🇺", "bank": "ECB"},
+        "jp": {"id": "IRSTCI01JPM156N", "start": "2000-01-01", "freq": "m", "name": "일본", "flag": "🇯🇵", "bank": "BOJ"},
+        "cn": {"id": "INTDSRCNM193N", "start": "2000-01-01", "freq": "m", "name": "중국", "flag": "🇨🇳", "bank": "PBoC"},
+    },
+    "Debt/GDP": {
+        "us": {"id": "GFDEGDQ188S", "start": "2000-01-01", "freq": "a", "name": "미국", "flag": "🇺🇸"},
+        "jp": {"id": "GGGDTAJPA188N", "start": "2000-01-01", "freq": "a", "name": "일본", "flag": "🇯🇵"},
+        "eu": {"id": "GGGDTAEZA188N", "start": "2000-01-01", "freq": "a", "name": "유로존", "flag": "🇪🇺"},
+        "kr": {"id": "GGGDTAKRA188N", "start": "2000-01-01", "freq": "a", "name": "한국", "flag": "🇰🇷"},
+        "cn": {"id": "GGGDTACNA188N", "start": "2000-01-01", "freq": "a", "name": "중국", "flag": "🇨🇳"},
+    },
+    "PMI": {
+        "us": {"id": "USALOLITONOSTSAM", "start": "2015-01-01", "freq": "m", "name": "미국", "flag": "🇺🇸"},
+        "jp": {"id": "JPNLOLITONOSTSAM", "start": "2015-01-01", "freq": "m", "name": "일본", "flag": "🇯🇵"},
+        "eu": {"id": "EA19LOLITONOSTSAM", "start": "2015-01-01", "freq": "m", "name": "유로존", "flag": "🇪🇺"},
+        "kr": {"id": "KORLOLITONOSTSAM", "start": "2015-01-01", "freq": "m", "name": "한국", "flag": "🇰🇷"},
+        "cn": {"id": "CHNLOLITONOSTSAM", "start": "2015-01-01", "freq": "m", "name": "중국", "flag": "🇨🇳"},
+    },
+    "Unemployment": {
+        "us": {"id": "UNRATE", "start": "2000-01-01", "freq": "m", "name": "미국", "flag": "🇺🇸"},
+        "kr": {"id": "LRUN64TTKRM156S", "start": "2000-01-01", "freq": "m", "name": "한국", "flag": "🇰🇷"},
+        "eu": {"id": "LRHUTTTTEZM156S", "start": "2000-01-01", "freq": "m", "name": "유로존", "flag": "🇪🇺"},
+        "jp": {"id": "LRUN64TTJPM156S", "start": "2000-01-01", "freq": "m", "name": "일본", "flag": "🇯🇵"},
+        "cn": {"id": "LRUN64TTCNM156S", "start": "2000-01-01", "freq": "m", "name": "중국", "flag": "🇨🇳"},
+    },
+    "US CPI": {
+        "headline": {"id": "CPIAUCSL", "start": "1946-01-01", "freq": "m"},  # All Items CPI (Seasonally Adjusted)
+        "core": {"id": "CPILFESL", "start": "1957-01-01", "freq": "m"},      # Core CPI - All Items Less Food & Energy (SA)
+    },
+    "US PPI": {
+        "headline": {"id": "PPIACO", "start": "1913-01-01", "freq": "m"},  # All Commodities PPI
+        # Core PPI — PPIFES: Final Demand Less Foods, Energy, Trade Services (newer, better, starts 2013)
+        "core": {"id": "PPIFES", "start": "2009-01-01", "freq": "m", "accept": {"min_points": 24},
+                 "fallbacks": [
+                     {"id": "WPSFD4131", "start": "1974-01-01", "freq": "m"},  # Finished Goods Less Food & Energy (longer history)
+                 ]},
+    },
+    "CPI Components": {
+        "Shelter":   {"id": "CUSR0000SAH1", "start": "2018-01-01", "freq": "m"},  # 주거 (원래 작동하던 것)
+        "Energy":    {"id": "CPIENGSL", "start": "2018-01-01", "freq": "m"},      # 에너지 (SA, index)
+        "Food":      {"id": "CPIUFDSL", "start": "2018-01-01", "freq": "m"},      # 식품 (SA, index)
+        "Transport": {"id": "CPITRNSL", "start": "2018-01-01", "freq": "m"},      # 교통 (SA, index)
+        "Medical":   {"id": "CPIMEDSL", "start": "2018-01-01", "freq": "m"},      # 의료 (SA, index)
+        "Apparel":   {"id": "CPIAPPSL", "start": "2018-01-01", "freq": "m"},      # 의류 (SA, index)
+        "Education": {"id": "CPIEDUSL", "start": "2018-01-01", "freq": "m"},      # 교육·통신 (SA, index)
+    },
+    "Inflation Expectations": {
+        "t5yie": {"id": "T5YIE", "start": "2003-01-01", "freq": None},  # 5-Year Breakeven Inflation Rate (daily)
+    },
+}
+
+PERIODS_PER_YEAR = {"d": 260, "w": 52, "m": 12, "q": 4, "a": 1}  # 주기별 연간 관측치 수 (원래 주기 None 은 일간으로 봄)
+
+
+def series_request(spec):
+    """레지스트리 항목 → fred_fetch 인자 (series_id, start, freq)"""
+    return spec["id"], spec["start"], spec["freq"]
+
+
+def registry_requests(task, keys):
+    """태스크 항목들의 1순위 시리즈 요청 목록 (keys 순서대로)"""
+    return [series_request(SERIES_REGISTRY[task][key]) for key in keys]
+
+
+def chain_requests(spec):
+    """1순위 + 대체 시리즈 요청 목록 (fred_fetch_first 입력)"""
+    return [series_request(spec)] + [series_request(fb) for fb in spec.get("fallbacks", [])]
+
+
+def expected_cost(request):
+    """요청의 예상 비용 — 받을 관측치 수 추정"""
+    _, start, freq = request
+    years = max(1, int(TODAY[:4]) - int(start[:4]) + 1)
+    return years * PERIODS_PER_YEAR[freq or "d"]
+
+
+def plan_fetches(outputs):
+    """
+    선택된 출력 파일이 의존하는 1순위 시리즈 요청을 I/O 전에 모아 한 번에 제출 (GRAPH 조상 탐색).
+    같은 (series_id, freq) 는 가장 이른 시작일 하나로 넓혀 한 번만 받고 (나머지는 coalescer 가 잘라서 공유),
+    예상 비용이 큰 요청부터 제출 — 긴 다운로드가 마지막에 시작해 실행 시간을 늘리지 않게.
+    대체 시리즈는 1순위가 실패/지연될 때만 받으므로 계획에 넣지 않음.
+    --skip-unchanged 면 다운로드를 하나라도 보내기 전에 계획된 시리즈의 메타데이터를 먼저 모두 조회 —
+    바뀐 시리즈만 받으면 되는지가 다운로드 시작 전에 정해지고, 조회가 다운로드 사이사이에 끼지 않음
+    Returns: 제출한 요청 목록
+    """
+    wanted = {}
+    entries = 0
+    for series_id, start, freq in GRAPH.requests(outputs):
+        key = (series_id, freq)
+        wanted[key] = min(wanted.get(key, start), start)
+        entries += 1
+    plan = sorted(((sid, start, freq) for (sid, freq), start in wanted.items()), key=expected_cost, reverse=True)
+    if SKIP_UNCHANGED:
+        series_ids = sorted({series_id for series_id, _, _ in plan})
+        list(get_fetch_pool().map(series_last_updated, series_ids))
+    for request in plan:
+        owner, entry = claim_fetch(*request, planned=True)
+        if owner:
+            get_fetch_pool().submit(resolve_fetch, *request, entry)
+    print(f"🗺️ Fetch plan: {len(plan)} requests for {entries} registry series")
+    print()
+    return plan
+
+
+# ═══════════════════════════════════════
+# INCREMENTAL DERIVED SERIES (꼬리 재계산)
+# ═══════════════════════════════════════
+# --incremental / --skip-unchanged 에서는 원본 저장소가 시리즈별로 처음 바뀐 관측일을 알려줌.
+# 변환 결과(YoY, forward fill, 월평균, 범위 자르기)는 data/derived 에 저장해 두고
+# 그 날짜 이후에 영향을 받는 꼬리 구간만 다시 계산해 저장본 앞부분에 이어 붙임.
+
+def changed_since(requests):
+    """입력 시리즈들 중 가장 이른 변경일 (None = 모두 변화 없음, "" = 알 수 없음 → 전체 재계산)"""
+    since = None
+    for series_id, _, freq in requests:
+        change = _raw_changes.get((series_id, freq), "")
+        if change is not None and (since is None or change < since):
+            since = change
+    return since
+
+
+def derived_path(name):
+    return DERIVED_DIR / (re.sub(r"[^\w-]+", "_", name) + ".json")
+
+
+def load_derived(name, requests):
+    """저장된 변환 결과 (dates, values) — 없거나 입력 시리즈 구성이 달라졌으면 None"""
+    try:
+        with open(derived_path(name), encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if stored.get("inputs") != [list(request) for request in requests]:
+        return None
+    return np.array(stored["dates"], dtype=f"datetime64[{stored['unit']}]"), stored["values"]
+
+
+def save_derived(name, requests, result):
+    """변환 결과 저장 (dates 는 단위와 함께 문자열로)"""
+    DERIVED_DIR.mkdir(exist_ok=True)
+    dates, values = result
+    with open(derived_path(name), "w", encoding="utf-8") as f:
+        json.dump({
+            "node": name,
+            "inputs": [list(request) for request in requests],
+            "unit": np.datetime_data(dates.dtype)[0],
+            "dates": format_dates(dates),
+            "values": values,
+        }, f, separators=(",", ":"))
+
+
+def same_result(a, b):
+    return np.array_equal(a[0], b[0]) and a[1] == b[1]
+
+
+def derive(name, requests, full, tail=None):
+    """
+    변환 노드 값을 증분 계산.
+    full() → 전체 재계산 (dates, values), tail(prev, since) → since 이후 영향 구간만 다시 계산해 prev 에 병합.
+    requests: 입력 원본 시리즈 요청 — 변경일 조회 + 저장본이 같은 입력에서 나온 것인지 확인.
+    incremental 모드가 아니면 항상 full()
+    """
+    if not (INCREMENTAL or SKIP_UNCHANGED):
+        return full()
+    since = changed_since(requests)
+    prev = load_derived(name, requests)
+    if prev is None or since == "" or tail is None:
+        count_stat("derived_full")
+        result = full()
+    elif since is None:
+        count_stat("derived_reused")
+        result = prev
+    else:
+        count_stat("derived_tail")
+        result = tail(prev, since)
+    if VERIFY_INCREMENTAL:
+        expected = full()
+        if not same_result(result, expected):
+            print(f"  ⚠️ {name}: incremental result differs from full recompute (since {since or '-'}) — using full")
+            count_stat("derived_mismatch")
+            result = expected
+    if result is not prev:
+        save_derived(name, requests, result)
+    return result
+
+
+def tail_cut(since, dates):
+    """변경일을 dates 단위로 내림 (월간이면 그 달, 연간이면 그 해)"""
+    return np.datetime64(since, "D").astype(np.asarray(dates).dtype)
+
+
+def splice_tail(prev, tail, since):
+    """prev 의 변경일 이전 구간 + tail 의 변경일 이후 구간 (values 는 리스트 또는 {key: 리스트})"""
+    prev_dates, prev_values = prev
+    tail_dates, tail_values = tail
+    cut = tail_cut(since, prev_dates)
+    i = int(np.searchsorted(prev_dates, cut))
+    j = int(np.searchsorted(tail_dates, cut))
+    dates = np.concatenate([prev_dates[:i], tail_dates[j:]])
+    if isinstance(prev_values, dict):
+        return dates, {key: prev_values[key][:i] + tail_values[key][j:] for key in tail_values}
+    return dates, prev_values[:i] + tail_values[j:]
+
+
+def yoy_tail(dates, values, prev, since, decimals=1):
+    """YoY 꼬리 — 변경 월부터 다시 계산 (기준값 때문에 입력은 12개월 전 달부터)"""
+    start = (tail_cut(since, prev[0]) - 12).astype("datetime64[D]")
+    i = int(np.searchsorted(dates, start))
+    return splice_tail(prev, yoy_by_month(dates[i:], values[i:], decimals), since)
+
+
+def clamp_tail(dates, values, prev, since, func):
+    """값별 변환(범위 자르기 등) 꼬리 — 변경일 이후 관측치만 다시 변환"""
+    i = int(np.searchsorted(dates, tail_cut(since, dates)))
+    return splice_tail(prev, (dates[i:], [func(x) for x in values[i:]]), since)
+
+
+def resample_tail(dates, values, prev, since, func):
+    """기간 집계(월평균 등) 꼬리 — 변경일이 속한 기간의 첫날부터 다시 집계. func(dates, values) → (periods, values)"""
+    start = tail_cut(since, prev[0]).astype("datetime64[D]")
+    i = int(np.searchsorted(dates, start))
+    return splice_tail(prev, func(dates[i:], values[i:]), since)
+
+
+def align_tail(series, prev, since, seed=0, leading="seed"):
+    """
+    forward fill 꼬리 — 시리즈마다 변경일 이후 관측치 + 직전 관측치 하나(채울 값)만으로 다시 정렬.
+    변경일 이전 날짜축/값은 바뀐 입력이 없으므로 저장본 그대로 (max_gap 없는 정렬만 해당)
+    """
+    sliced = {}
+    for key, (dates, values) in series.items():
+        dates = np.asarray(dates)
+        i = max(int(np.searchsorted(dates, tail_cut(since, dates))) - 1, 0) if len(dates) else 0
+        sliced[key] = (dates[i:], values[i:])
+    return splice_tail(prev, align_series(sliced, seed, None, leading), since)
+
+
+def align_derived(name, requests, series, seed=0, max_gap=None, leading="seed"):
+    """align_series + 증분 재계산 (requests: series 키 순서대로의 원본 시리즈 요청)"""
+    tail = None if max_gap is not None else lambda prev, since: align_tail(series, prev, since, seed, leading)
+    return derive(name, requests, lambda: align_series(series, seed, max_gap, leading), tail)
+
+
+# ═══════════════════════════════════════
+# DERIVED SERIES GRAPH
+# ═══════════════════════════════════════
+class SeriesGraph:
+    """
+    지연 계산 그래프 — 노드는 원본 시리즈(fred:), 변환(yoy:, pmi:, monthly: ...), 출력 파일(*.json).
+    get(name) 은 그 노드가 실제로 꺼내 쓰는 조상만 계산하고 결과는 실행 동안 메모이즈 (실패는 저장 안 함 —
+    대신 failed 에 기록해, 태스크가 일부 시리즈를 빼고 저장했는지 알 수 있게 함).
+    deps 는 사전 요청 계획(plan_fetches)과 부분 실행(--only)에서 조상을 찾을 때, 그리고 aget 이 입력을 함께 기다릴 때 씀
+    """
+
+    def __init__(self):
+        self.nodes = {}   # name → (func, deps, request, afunc)
+        self.tasks = {}   # aget: 노드 → 계산 중/끝난 asyncio Task (이벤트 루프 스레드에서만 접근)
+        self.values = {}
+        self.failed = set()  # 이번 실행에서 계산에 실패한 노드 (나중에 성공하면 빠짐)
+        self.locks = {}   # 노드별 계산 잠금 — 여러 태스크가 같은 노드를 동시에 요청해도 한 번만 계산
+        self.lock = threading.Lock()
+
+    def add(self, name, func, deps=(), request=None, afunc=None):
+        """
+        노드 등록. func(get) → 값, request: 원본 노드면 fred_fetch 인자 (series_id, start, freq),
+        afunc() → 코루틴: 원본 노드의 awaitable 계산 (aget 에서 func 대신 사용)
+        """
+        self.nodes[name] = (func, tuple(deps), request, afunc)
+
+    def _cached(self, name):
+        with self.lock:
+            if name in self.values:
+                count_stat("graph_hits")
+                return True, self.values[name]
+            return False, self.locks.setdefault(name, threading.Lock())
+
+    def get(self, name):
+        """노드 값 (처음이면 계산해서 저장)"""
+        found, value = self._cached(name)
+        if found:
+            return value
+        with value:
+            found, cached = self._cached(name)  # 기다리는 동안 다른 스레드가 계산했을 수 있음
+            if found:
+                return cached
+            try:
+                result = self.nodes[name][0](self.get)
+            except Exception:
+                with self.lock:
+                    self.failed.add(name)
+                raise
+            with self.lock:
+                self.values[name] = result
+                self.failed.discard(name)
+            count_stat("graph_evaluated")
+            return result
+
+    async def aget(self, name):
+        """
+        get 의 awaitable 버전 (async_main 용).
+        선언된 deps 를 asyncio.gather 로 함께 기다린 뒤 계산 — 원본 노드는 afunc(fred_fetch_async 등)라
+        기다리는 동안 스레드를 잡지 않고, 변환/출력 노드의 동기 계산(파일 저장 포함)만 executor 에서 실행.
+        같은 노드를 기다리는 코루틴들은 asyncio Task 하나를 공유 (이번 실행 동안은 실패도 공유해 다시 요청하지 않음)
+        """
+        found, value = self._cached(name)
+        if found:
+            return value
+        task = self.tasks.get(name)
+        if task is None:
+            task = self.tasks[name] = asyncio.ensure_future(self._aevaluate(name))
+        return await asyncio.shield(task)  # 기다리던 쪽이 취소돼도 다른 쪽이 기다리는 계산은 계속
+
+    async def _aevaluate(self, name):
+        func, deps, _, afunc = self.nodes[name]
+        try:
+            if afunc is not None:
+                result = await afunc()
+            else:
+                values = await asyncio.gather(*(self.aget(dep) for dep in deps), return_exceptions=True)
+                inputs = dict(zip(deps, values))
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, func, lambda dep: self._input(inputs, dep))
+        except Exception:
+            with self.lock:
+                self.failed.add(name)
+            raise
+        with self.lock:
+            self.values[name] = result
+            self.failed.discard(name)
+        count_stat("graph_evaluated")
+        return result
+
+    def _input(self, inputs, name):
+        """aget 이 미리 받은 입력 (실패했으면 그 오류) — 선언 안 된 노드는 동기 get"""
+        if name not in inputs:
+            return self.get(name)
+        if isinstance(inputs[name], BaseException):
+            raise inputs[name]
+        return inputs[name]
+
+    def ancestors(self, names):
+        """names 와 그 조상 노드 전부"""
+        seen, stack = set(), list(names)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self.nodes[name][1])
+        return seen
+
+    def failed_ancestors(self, names):
+        """names 의 조상 중 이번 실행에서 실패한 노드 (정렬)"""
+        ancestors = self.ancestors(names)
+        with self.lock:
+            return sorted(self.failed & ancestors)
+
+    def requests(self, names):
+        """names 를 계산하는 데 필요한 원본 시리즈 요청 목록"""
+        return [self.nodes[name][2] for name in self.ancestors(names) if self.nodes[name][2] is not None]
+
+    def reset(self):
+        """실행마다 메모 초기화"""
+        with self.lock:
+            self.values.clear()
+            self.failed.clear()
+            self.locks.clear()
+            self.tasks.clear()
+
+
+GRAPH = SeriesGraph()
+
+
+def series_node(task, key):
+    """레지스트리 항목의 원본 노드 이름"""
+    return f"fred:{task}/{key}"
+
+
+def series_accept(spec):
+    """레지스트리 accept 조건 → fred_fetch_first 의 accept(dates, values) (없으면 None)"""
+    rule = spec.get("accept")
+    if not rule:
+        return None
+    min_points = rule.get("min_points", 0)
+    min_last = np.datetime64(rule["min_last"]) if "min_last" in rule else None
+    return lambda d, v: len(d) >= min_points and (min_last is None or d[-1] >= min_last)
+
+
+def fetch_series_node(spec):
+    """원본 노드 계산 함수 — 대체 시리즈가 있으면 (index, dates, values), 없으면 (dates, values)"""
+    if spec.get("fallbacks"):
+        return lambda get: fred_fetch_first(chain_requests(spec), accept=series_accept(spec))
+    request = series_request(spec)
+    return lambda get: fred_fetch(*request)
+
+
+def fetch_series_node_async(spec):
+    """fetch_series_node 의 awaitable 버전 (SeriesGraph.aget 용) — 같은 형태의 값을 돌려주는 코루틴 함수"""
+    if spec.get("fallbacks"):
+        return lambda: fred_fetch_first_async(chain_requests(spec), accept=series_accept(spec))
+    request = series_request(spec)
+    return lambda: fred_fetch_async(*request)
+
+
+def series_input(get, task, key):
+    """원본 노드 값 → (실제로 받은 시리즈 요청, dates, values, 대체 체인 index)"""
+    spec = SERIES_REGISTRY[task][key]
+    value = get(series_node(task, key))
+    idx, dates, values = value if spec.get("fallbacks") else (0, *value)
+    return chain_requests(spec)[idx], dates, values, idx
+
+
+def yoy_node(task, key):
+    """월간 지수 노드 → (months, yoy) (대체 체인이면 실제로 받은 시리즈 기준)"""
+    name = f"yoy:{task}/{key}"
+
+    def compute(get):
+        request, dates, values, _ = series_input(get, task, key)
+        return derive(name, [request], lambda: yoy_by_month(dates, values),
+                      lambda prev, since: yoy_tail(dates, values, prev, since))
+    return compute
+
+
+def latest_rate(get, label):
+    """만기별 최신 금리 (받지 못했으면 0)"""
+    try:
+        _, values = get(series_node("Yield Curve", label))
+    except Exception:
+        return 0
+    return values[-1] if values else 0
+
+
+def spread_node(long, short):
+    """장단기 금리차 노드 (최신값 기준, %p)"""
+    return lambda get: round(latest_rate(get, long) - latest_rate(get, short), 2)
+
+
+def m2_country_node(key, spec):
+    """
+    국가별 M3 YoY 노드 → (dates, values, 사용한 대체 시리즈 항목 또는 None).
+    1순위(YoY 시리즈)는 그대로 반올림, 대체 시리즈(레벨)면 직접 YoY 계산 후 2015년 이후만
+    """
+    def compute(get):
+        request, d, v, idx = series_input(get, "Global M2", key)
+        if idx == 0:
+            return d, [round(x, 2) for x in v], None
+        # KR fallback: 레벨 데이터에서 직접 YoY 계산
+        fallback = spec["fallbacks"][idx - 1]
+        levels = np.asarray(v) / fallback["div"]
+        months, yoy = derive(f"m2:{key}/yoy", [request], lambda: yoy_by_month(d, levels, decimals=2),
+                             lambda prev, since: yoy_tail(d, levels, prev, since, decimals=2))
+        # 2015-01-01 이후만 필터
+        keep = int(np.searchsorted(months, np.datetime64("2015-01", "M")))
+        return to_dates(months[keep:]), yoy[keep:], fallback
+    return compute
+
+
+def pmi_scale(x):
+    """OECD CLI → PMI 스케일 (100 기준 → 50 기준, 30~65 로 자름)"""
+    return round(max(30, min(65, (x - 100) * 5 + 50)), 1)
+
+
+def pmi_node(key):
+    """국가별 PMI 스케일 노드 → (dates, values)"""
+    name = f"pmi:{key}"
+
+    def compute(get):
+        request, d, v, _ = series_input(get, "PMI", key)
+        return derive(name, [request], lambda: (d, [pmi_scale(x) for x in v]),
+                      lambda prev, since: clamp_tail(d, v, prev, since, pmi_scale))
+    return compute
+
+
+def monthly_means(dates, values):
+    """일간 → 월평균 (months, values 소수 둘째 자리)"""
+    vals = [round(v, 2) for v in values]
+    months, means = resample(dates, vals, "m", "mean")
+    return months, [round(x, 2) for x in means.tolist()]
+
+
+def monthly_mean_node(task, key):
+    """일간 노드 → 월평균 노드 (months, values)"""
+    name = f"monthly:{task}/{key}"
+
+    def compute(get):
+        request, dates, values, _ = series_input(get, task, key)
+        return derive(name, [request], lambda: monthly_means(dates, values),
+                      lambda prev, since: resample_tail(dates, values, prev, since, monthly_means))
+    return compute
 
 
 # ═══════════════════════════════════════
 # 1. GLOBAL M2
 # ═══════════════════════════════════════
-def fetch_m2():
+def fetch_m2(get):
     print("📊 Fetching Global M2...")
 
     # --- 합산용 (기존 로직 유지) ---
-    us_dates, us_values = fred_fetch("M2SL", start="2015-01-01", freq="m")
+    us_dates, us_values = get(series_node("Global M2", "total"))
     us_t = [v / 1000 for v in us_values]
     total_values = [round(v * 4.3, 1) for v in us_t]
     total_yoy = round(((total_values[-1] - total_values[-13]) / total_values[-13]) * 100, 1) if len(total_values) > 13 else 0
 
-    # --- 국가별: YoY % 성장률 (새 OECD 시리즈, 2025년까지 업데이트) ---
-    # 기존 MABMM301*M189S 시리즈는 2023년에 단종됨
-    # 새 시리즈: {COUNTRY}MABMM301GYSAM = Growth rate YoY, Seasonally Adjusted, Monthly
-    yoy_series = {
-        "us": ("USAMABMM301GYSAM", "미국", "🇺🇸"),
-        "eu": ("EA19MABMM301GYSAM", "유로존", "🇪🇺"),
-        "jp": ("JPNMABMM301GYSAM", "일본", "🇯🇵"),
-        "kr": ("KORMABMM301GYSAM", "한국", "🇰🇷"),
-    }
-
-    # KR M3 growth가 없을 경우 대체 시리즈 (수동 YoY 계산)
-    kr_fallback_series = [
-        ("MYAGM2KRM189S", 1),   # IMF M2 for Korea (national currency)
-        ("MABMM301KRM189S", 1), # OECD M3 old format (단종됐지만 과거 데이터용)
-    ]
-
-    all_dates = set()
     raw_series = {}
     countries_info = {}
+    requests_used = []
 
-    for key, (sid, name, flag) in yoy_series.items():
+    for key, spec in SERIES_REGISTRY["Global M2"].items():
+        if key == "total":
+            continue
+        name, flag = spec["name"], spec["flag"]
         try:
-            d, v = fred_fetch(sid, start="2015-01-01", freq="m")
-            vals = [round(x, 2) for x in v]
-            raw_series[key] = dict(zip(d, vals))
-            all_dates.update(d)
+            d, vals, fallback = get(f"m2:{key}")
+            if fallback and not vals:
+                # 대체 시리즈에서 2015년 이후 YoY를 못 만들면 (기존 동작대로) 국가 제외
+                print(f"  ⚠️ {key} fallback ({fallback['id']}): 2015년 이후 YoY 없음 — 건너뜀")
+                continue
+            raw_series[key] = (d, vals)
+            requests_used.append(series_request(fallback or spec))
             current_yoy = vals[-1] if vals else 0
-            countries_info[key] = {"name": name, "flag": flag, "yoy_pct": current_yoy}
-            print(f"  ✅ {key} M3 YoY: {len(d)} pts, latest={current_yoy}%")
+            countries_info[key] = {"name": name, "flag": flag, "yoy_pct": current_yoy, "stats": card_stats(d, vals)}
+            if fallback:
+                print(f"  ✅ {key} fallback ({fallback['id']}): {len(d)} pts, latest={current_yoy}%")
+            else:
+                print(f"  ✅ {key} M3 YoY: {len(d)} pts, latest={current_yoy}%")
         except Exception as e:
             print(f"  ⚠️ {key} M3 YoY fetch failed: {e}")
-            # KR fallback: 레벨 데이터에서 직접 YoY 계산
-            if key == "kr":
-                for fb_sid, fb_div in kr_fallback_series:
-                    try:
-                        d, v = fred_fetch(fb_sid, start="2014-01-01", freq="m")
-                        vals = [x / fb_div for x in v]
-                        # 12개월 전 대비 YoY% 계산
-                        yoy_vals = []
-                        yoy_dates = []
-                        for i in range(12, len(vals)):
-                            if vals[i - 12] != 0:
-                                yoy_pct = round(((vals[i] - vals[i - 12]) / vals[i - 12]) * 100, 2)
-                            else:
-                                yoy_pct = 0
-                            yoy_vals.append(yoy_pct)
-                            yoy_dates.append(d[i])
-                        # 2015-01-01 이후만 필터
-                        filtered = [(dt, vl) for dt, vl in zip(yoy_dates, yoy_vals) if dt >= "2015-01-01"]
-                        if filtered:
-                            fd, fv = zip(*filtered)
-                            raw_series[key] = dict(zip(fd, fv))
-                            all_dates.update(fd)
-                            countries_info[key] = {"name": name, "flag": flag, "yoy_pct": fv[-1]}
-                            print(f"  ✅ {key} fallback ({fb_sid}): {len(fd)} pts, latest={fv[-1]}%")
-                            break
-                    except Exception as e2:
-                        print(f"  ⚠️ {key} fallback {fb_sid} failed: {e2}")
 
     # 공통 날짜 정렬 + forward fill
-    sorted_dates = sorted(all_dates)
-    aligned_series = {}
-    for key in raw_series:
-        aligned_series[key] = []
-        last_val = 0
-        for d in sorted_dates:
-            if d in raw_series[key]:
-                last_val = raw_series[key][d]
-            aligned_series[key].append(last_val)
+    sorted_dates, aligned_series = align_derived("aligned:Global M2", requests_used, raw_series, seed=0)
 
     save_json("m2.json", {
         "last_updated": TODAY,
@@ -177,11 +1969,12 @@ def fetch_m2():
             "current_value": total_values[-1] if total_values else 0,
             "yoy_pct": total_yoy,
             "unit": "trillion_usd",
-            "dates": us_dates,
+            "stats": card_stats(us_dates, total_values),
+            "dates": format_dates(us_dates),
             "values": total_values
         },
         "countries": countries_info,
-        "country_dates": sorted_dates,
+        "country_dates": format_dates(sorted_dates),
         "country_series": aligned_series
     })
 
@@ -189,18 +1982,20 @@ def fetch_m2():
 # ═══════════════════════════════════════
 # 2. FED BALANCE SHEET
 # ═══════════════════════════════════════
-def fetch_fed_bs():
+def fetch_fed_bs(get):
     print("🏛️ Fetching Fed Balance Sheet...")
-    dates, values = fred_fetch("WALCL", start="2008-01-01", freq="w")
+    dates, values = get(series_node("Fed Balance Sheet", "total"))
     vals_t = [round(v / 1000000, 2) for v in values]
     weekly_change = round(vals_t[-1] - vals_t[-2], 3) if len(vals_t) >= 2 else 0
 
+    date_strs = format_dates(dates)
     save_json("fed_balance_sheet.json", {
-        "last_updated": dates[-1] if dates else TODAY,
+        "last_updated": date_strs[-1] if date_strs else TODAY,
         "current_value": vals_t[-1] if vals_t else 0,
         "weekly_change": weekly_change,
         "unit": "trillion_usd",
-        "dates": dates,
+        "stats": card_stats(dates, vals_t),
+        "dates": date_strs,
         "values": vals_t
     })
 
@@ -208,23 +2003,18 @@ def fetch_fed_bs():
 # ═══════════════════════════════════════
 # 3. YIELD CURVE
 # ═══════════════════════════════════════
-def fetch_yield_curve():
+def fetch_yield_curve(get):
     print("📐 Fetching Yield Curve...")
-    maturities = {
-        "1M": "DGS1MO", "3M": "DGS3MO", "6M": "DGS6MO",
-        "1Y": "DGS1", "2Y": "DGS2", "3Y": "DGS3",
-        "5Y": "DGS5", "7Y": "DGS7", "10Y": "DGS10",
-        "20Y": "DGS20", "30Y": "DGS30"
-    }
-
     current_rates = []
     one_year_ago_rates = []
     one_month_ago_rates = []
     mat_labels = []
+    history = {}
 
-    for label, sid in maturities.items():
+    for label in SERIES_REGISTRY["Yield Curve"]:
         try:
-            dates, values = fred_fetch(sid, start="2023-01-01")
+            dates, values = get(series_node("Yield Curve", label))
+            history[label] = (dates, values)
             if values:
                 current_rates.append(values[-1])
                 mat_labels.append(label)
@@ -235,9 +2025,16 @@ def fetch_yield_curve():
         except Exception as e:
             print(f"  ⚠️ {label} yield fetch failed: {e}")
 
-    rate_map = dict(zip(mat_labels, current_rates))
-    spread_2s10s = round(rate_map.get("10Y", 0) - rate_map.get("2Y", 0), 2)
-    spread_3m10y = round(rate_map.get("10Y", 0) - rate_map.get("3M", 0), 2)
+    spread_2s10s = get("spread:2s10s")
+    spread_3m10y = get("spread:3m10y")
+
+    def spread_stats(long, short):
+        """장단기 금리차 일별 이력(두 만기 공통 날짜)의 카드 통계"""
+        if long not in history or short not in history:
+            return card_stats([], [])
+        (l_dates, l_vals), (s_dates, s_vals) = history[long], history[short]
+        common, l_idx, s_idx = np.intersect1d(l_dates, s_dates, assume_unique=True, return_indices=True)
+        return card_stats(common, np.asarray(l_vals)[l_idx] - np.asarray(s_vals)[s_idx])
 
     def spread_status(s):
         if s < -0.1: return "INVERTED"
@@ -253,7 +2050,8 @@ def fetch_yield_curve():
             "2s10s": spread_2s10s,
             "3m10y": spread_3m10y,
             "2s10s_status": spread_status(spread_2s10s),
-            "3m10y_status": spread_status(spread_3m10y)
+            "3m10y_status": spread_status(spread_3m10y),
+            "stats": {"2s10s": spread_stats("10Y", "2Y"), "3m10y": spread_stats("10Y", "3M")}
         }
     })
 
@@ -261,9 +2059,9 @@ def fetch_yield_curve():
 # ═══════════════════════════════════════
 # 4. NFCI (Financial Conditions)
 # ═══════════════════════════════════════
-def fetch_nfci():
+def fetch_nfci(get):
     print("🌡️ Fetching NFCI...")
-    dates, values = fred_fetch("NFCI", start="2000-01-01", freq="w")
+    dates, values = get(series_node("NFCI", "nfci"))
     vals = [round(v, 2) for v in values]
     current = vals[-1] if vals else 0
 
@@ -276,12 +2074,14 @@ def fetch_nfci():
     else:
         status, status_en = "긴축적", "tight"
 
+    date_strs = format_dates(dates)
     save_json("nfci.json", {
-        "last_updated": dates[-1] if dates else TODAY,
+        "last_updated": date_strs[-1] if date_strs else TODAY,
         "current_value": current,
         "status": status,
         "status_en": status_en,
-        "dates": dates,
+        "stats": card_stats(dates, vals),
+        "dates": date_strs,
         "values": vals
     })
 
@@ -289,49 +2089,33 @@ def fetch_nfci():
 # ═══════════════════════════════════════
 # 5. INTEREST RATES (G7 + Korea)
 # ═══════════════════════════════════════
-def fetch_rates():
+def fetch_rates(get):
     print("🏦 Fetching Interest Rates...")
-    rate_series = {
-        "us": ("DFEDTARU", "미국", "🇺🇸", "Fed"),
-        "kr": ("IRSTCI01KRM156N", "한국", "🇰🇷", "BOK"),
-        "eu": ("ECBMRRFR", "유로존", "🇪🇺", "ECB"),
-        "jp": ("IRSTCI01JPM156N", "일본", "🇯🇵", "BOJ"),
-        "cn": ("INTDSRCNM193N", "중국", "🇨🇳", "PBoC"),
-    }
-
-    all_dates = set()
     series_data = {}
     countries_info = {}
 
-    for key, (sid, name, flag, bank) in rate_series.items():
+    for key, spec in SERIES_REGISTRY["Interest Rates"].items():
         try:
-            d, v = fred_fetch(sid, start="2000-01-01", freq="m")
-            series_data[key] = dict(zip(d, v))
-            all_dates.update(d)
+            d, v = get(series_node("Interest Rates", key))
+            series_data[key] = (d, [round(x, 2) for x in v])
             current = v[-1] if v else 0
             prev = v[-2] if len(v) >= 2 else current
             countries_info[key] = {
-                "name": name, "flag": flag, "bank": bank,
+                "name": spec["name"], "flag": spec["flag"], "bank": spec["bank"],
                 "current": round(current, 2),
-                "prev_change": round(current - prev, 2)
+                "prev_change": round(current - prev, 2),
+                "stats": card_stats(*series_data[key])
             }
         except Exception as e:
             print(f"  ⚠️ {key} rate fetch failed: {e}")
 
-    sorted_dates = sorted(all_dates)
-    aligned_series = {}
-    for key in series_data:
-        aligned_series[key] = []
-        last_val = 0
-        for d in sorted_dates:
-            if d in series_data[key]:
-                last_val = round(series_data[key][d], 2)
-            aligned_series[key].append(last_val)
+    requests_used = registry_requests("Interest Rates", series_data)
+    sorted_dates, aligned_series = align_derived("aligned:Interest Rates", requests_used, series_data, seed=0)
 
     save_json("rates.json", {
         "last_updated": TODAY,
         "countries": countries_info,
-        "dates": sorted_dates,
+        "dates": format_dates(sorted_dates),
         "series": aligned_series
     })
 
@@ -339,45 +2123,28 @@ def fetch_rates():
 # ═══════════════════════════════════════
 # 6. DEBT / GDP
 # ═══════════════════════════════════════
-def fetch_debt_gdp():
+def fetch_debt_gdp(get):
     print("💳 Fetching Debt/GDP...")
-    debt_series = {
-        "us": ("GFDEGDQ188S", "미국", "🇺🇸"),
-        "jp": ("GGGDTAJPA188N", "일본", "🇯🇵"),
-        "eu": ("GGGDTAEZA188N", "유로존", "🇪🇺"),
-        "kr": ("GGGDTAKRA188N", "한국", "🇰🇷"),
-        "cn": ("GGGDTACNA188N", "중국", "🇨🇳"),
-    }
-
-    all_dates = set()
     series_data = {}
     countries_info = {}
 
-    for key, (sid, name, flag) in debt_series.items():
+    for key, spec in SERIES_REGISTRY["Debt/GDP"].items():
         try:
-            d, v = fred_fetch(sid, start="2000-01-01", freq="a")
-            yearly_dates = [dt[:4] for dt in d]
-            series_data[key] = dict(zip(yearly_dates, v))
-            all_dates.update(yearly_dates)
+            d, v = get(series_node("Debt/GDP", key))
+            series_data[key] = (d.astype("datetime64[Y]"), [round(x) for x in v])
             current = round(v[-1]) if v else 0
-            countries_info[key] = {"name": name, "flag": flag, "current": current}
+            countries_info[key] = {"name": spec["name"], "flag": spec["flag"], "current": current,
+                                   "stats": card_stats(*series_data[key])}
         except Exception as e:
             print(f"  ⚠️ {key} debt/GDP fetch failed: {e}")
 
-    sorted_dates = sorted(all_dates)
-    aligned_series = {}
-    for key in series_data:
-        aligned_series[key] = []
-        last_val = 0
-        for d in sorted_dates:
-            if d in series_data[key]:
-                last_val = round(series_data[key][d])
-            aligned_series[key].append(last_val)
+    requests_used = registry_requests("Debt/GDP", series_data)
+    sorted_dates, aligned_series = align_derived("aligned:Debt/GDP", requests_used, series_data, seed=0)
 
     save_json("debt_gdp.json", {
         "last_updated": TODAY,
         "countries": countries_info,
-        "dates": sorted_dates,
+        "dates": format_dates(sorted_dates),
         "series": aligned_series
     })
 
@@ -385,51 +2152,34 @@ def fetch_debt_gdp():
 # ═══════════════════════════════════════
 # 7. GLOBAL PMI (OECD CLI as proxy)
 # ═══════════════════════════════════════
-def fetch_pmi():
+def fetch_pmi(get):
     print("🏭 Fetching PMI (OECD CLI)...")
-    pmi_series = {
-        "us": ("USALOLITONOSTSAM", "미국", "🇺🇸"),
-        "jp": ("JPNLOLITONOSTSAM", "일본", "🇯🇵"),
-        "eu": ("EA19LOLITONOSTSAM", "유로존", "🇪🇺"),
-        "kr": ("KORLOLITONOSTSAM", "한국", "🇰🇷"),
-        "cn": ("CHNLOLITONOSTSAM", "중국", "🇨🇳"),
-    }
-
-    all_dates = set()
     series_data = {}
     countries_info = {}
 
-    for key, (sid, name, flag) in pmi_series.items():
+    for key, spec in SERIES_REGISTRY["PMI"].items():
         try:
-            d, v = fred_fetch(sid, start="2015-01-01", freq="m")
-            pmi_vals = [round(max(30, min(65, (x - 100) * 5 + 50)), 1) for x in v]
-            series_data[key] = dict(zip(d, pmi_vals))
-            all_dates.update(d)
+            d, pmi_vals = get(f"pmi:{key}")
+            series_data[key] = (d, pmi_vals)
 
             current = pmi_vals[-1] if pmi_vals else 50
             prev = pmi_vals[-2] if len(pmi_vals) >= 2 else current
             countries_info[key] = {
-                "name": name, "flag": flag,
+                "name": spec["name"], "flag": spec["flag"],
                 "current": current,
-                "prev_change": round(current - prev, 1)
+                "prev_change": round(current - prev, 1),
+                "stats": card_stats(*series_data[key])
             }
         except Exception as e:
             print(f"  ⚠️ {key} PMI fetch failed: {e}")
 
-    sorted_dates = sorted(all_dates)
-    aligned_series = {}
-    for key in series_data:
-        aligned_series[key] = []
-        last_val = 50
-        for d in sorted_dates:
-            if d in series_data[key]:
-                last_val = series_data[key][d]
-            aligned_series[key].append(last_val)
+    requests_used = registry_requests("PMI", series_data)
+    sorted_dates, aligned_series = align_derived("aligned:PMI", requests_used, series_data, seed=50)
 
     save_json("pmi.json", {
         "last_updated": TODAY,
         "countries": countries_info,
-        "dates": sorted_dates,
+        "dates": format_dates(sorted_dates),
         "series": aligned_series
     })
 
@@ -437,51 +2187,35 @@ def fetch_pmi():
 # ═══════════════════════════════════════
 # 8. UNEMPLOYMENT RATE
 # ═══════════════════════════════════════
-def fetch_unemployment():
+def fetch_unemployment(get):
     print("👷 Fetching Unemployment Rate...")
-    unemp_series = {
-        "us": ("UNRATE", "미국", "🇺🇸"),
-        "kr": ("LRUN64TTKRM156S", "한국", "🇰🇷"),
-        "eu": ("LRHUTTTTEZM156S", "유로존", "🇪🇺"),
-        "jp": ("LRUN64TTJPM156S", "일본", "🇯🇵"),
-        "cn": ("LRUN64TTCNM156S", "중국", "🇨🇳"),
-    }
-
-    all_dates = set()
     series_data = {}
     countries_info = {}
 
-    for key, (sid, name, flag) in unemp_series.items():
+    for key, spec in SERIES_REGISTRY["Unemployment"].items():
         try:
-            d, v = fred_fetch(sid, start="2000-01-01", freq="m")
+            d, v = get(series_node("Unemployment", key))
             vals = [round(x, 1) for x in v]
-            series_data[key] = dict(zip(d, vals))
-            all_dates.update(d)
+            series_data[key] = (d, vals)
 
             current = vals[-1] if vals else 0
             prev = vals[-2] if len(vals) >= 2 else current
             countries_info[key] = {
-                "name": name, "flag": flag,
+                "name": spec["name"], "flag": spec["flag"],
                 "current": current,
-                "prev_change": round(current - prev, 1)
+                "prev_change": round(current - prev, 1),
+                "stats": card_stats(*series_data[key])
             }
         except Exception as e:
             print(f"  ⚠️ {key} unemployment fetch failed: {e}")
 
-    sorted_dates = sorted(all_dates)
-    aligned_series = {}
-    for key in series_data:
-        aligned_series[key] = []
-        last_val = 0
-        for d in sorted_dates:
-            if d in series_data[key]:
-                last_val = series_data[key][d]
-            aligned_series[key].append(last_val)
+    requests_used = registry_requests("Unemployment", series_data)
+    sorted_dates, aligned_series = align_derived("aligned:Unemployment", requests_used, series_data, seed=0)
 
     save_json("unemployment.json", {
         "last_updated": TODAY,
         "countries": countries_info,
-        "dates": sorted_dates,
+        "dates": format_dates(sorted_dates),
         "series": aligned_series
     })
 
@@ -489,24 +2223,17 @@ def fetch_unemployment():
 # ═══════════════════════════════════════
 # 9. US CPI (Headline & Core YoY)
 # ═══════════════════════════════════════
-def fetch_cpi():
+def fetch_cpi(get):
     print("🔥 Fetching US CPI...")
-    # CPIAUCSL: All Items CPI (Seasonally Adjusted)
-    # CPILFESL: Core CPI - All Items Less Food & Energy (SA)
-    h_dates, h_vals = fred_fetch("CPIAUCSL", start="1946-01-01", freq="m")
-    c_dates, c_vals = fred_fetch("CPILFESL", start="1957-01-01", freq="m")
-
-    # YoY 계산
-    h_yoy_dates, h_yoy_vals = calc_yoy_from_index(h_dates, h_vals)
-    c_yoy_dates, c_yoy_vals = calc_yoy_from_index(c_dates, c_vals)
+    h_months, h_yoy = get("yoy:US CPI/headline")
+    c_months, c_yoy = get("yoy:US CPI/core")
 
     # 공통 날짜 맞추기
-    h_map = dict(zip(h_yoy_dates, h_yoy_vals))
-    c_map = dict(zip(c_yoy_dates, c_yoy_vals))
-    common_dates = sorted(set(h_yoy_dates) & set(c_yoy_dates))
+    common, h_idx, c_idx = np.intersect1d(h_months, c_months, assume_unique=True, return_indices=True)
+    common_dates = format_dates(common)
 
-    headline_series = [h_map[d] for d in common_dates]
-    core_series = [c_map[d] for d in common_dates]
+    headline_series = [h_yoy[i] for i in h_idx.tolist()]
+    core_series = [c_yoy[i] for i in c_idx.tolist()]
 
     h_current = headline_series[-1] if headline_series else None
     c_current = core_series[-1] if core_series else None
@@ -518,11 +2245,13 @@ def fetch_cpi():
         "latest_date": common_dates[-1] if common_dates else "",
         "headline": {
             "current": h_current,
-            "prev_change": round(h_current - h_prev, 1) if h_current and h_prev else 0
+            "prev_change": round(h_current - h_prev, 1) if h_current and h_prev else 0,
+            "stats": card_stats(h_months, h_yoy)
         },
         "core": {
             "current": c_current,
-            "prev_change": round(c_current - c_prev, 1) if c_current and c_prev else 0
+            "prev_change": round(c_current - c_prev, 1) if c_current and c_prev else 0,
+            "stats": card_stats(c_months, c_yoy)
         },
         "dates": common_dates,
         "series": {
@@ -536,32 +2265,20 @@ def fetch_cpi():
 # ═══════════════════════════════════════
 # 10. US PPI (Headline & Core YoY)
 # ═══════════════════════════════════════
-def fetch_ppi():
+def fetch_ppi(get):
     print("🏭 Fetching US PPI...")
-    # PPIACO: All Commodities PPI
-    # PPIFES: Final Demand Less Foods, Energy, Trade Services (Core-ish, starts 2013)
-    # WPSFD4131: Finished Goods Less Food & Energy (longer history, starts 1974)
-    h_dates, h_vals = fred_fetch("PPIACO", start="1913-01-01", freq="m")
-
-    # Core PPI — try PPIFES first (newer, better), fallback to WPSFD4131
-    try:
-        c_dates, c_vals = fred_fetch("PPIFES", start="2009-01-01", freq="m")
-        if len(c_vals) < 24:
-            raise ValueError("Not enough PPIFES data")
-    except Exception:
+    h_months, h_yoy = get("yoy:US PPI/headline")
+    # Core PPI — PPIFES 우선, 늦거나 실패하면 WPSFD4131 헤지 요청 (레지스트리 fallbacks)
+    idx, _, _ = get(series_node("US PPI", "core"))
+    if idx > 0:
         print("  ℹ️ PPIFES unavailable, using WPSFD4131")
-        c_dates, c_vals = fred_fetch("WPSFD4131", start="1974-01-01", freq="m")
-
-    # YoY 계산
-    h_yoy_dates, h_yoy_vals = calc_yoy_from_index(h_dates, h_vals)
-    c_yoy_dates, c_yoy_vals = calc_yoy_from_index(c_dates, c_vals)
+    c_months, c_yoy = get("yoy:US PPI/core")
 
-    h_map = dict(zip(h_yoy_dates, h_yoy_vals))
-    c_map = dict(zip(c_yoy_dates, c_yoy_vals))
-    common_dates = sorted(set(h_yoy_dates) & set(c_yoy_dates))
+    common, h_idx, c_idx = np.intersect1d(h_months, c_months, assume_unique=True, return_indices=True)
+    common_dates = format_dates(common)
 
-    headline_series = [h_map[d] for d in common_dates]
-    core_series = [c_map[d] for d in common_dates]
+    headline_series = [h_yoy[i] for i in h_idx.tolist()]
+    core_series = [c_yoy[i] for i in c_idx.tolist()]
 
     h_current = headline_series[-1] if headline_series else None
     c_current = core_series[-1] if core_series else None
@@ -573,11 +2290,13 @@ def fetch_ppi():
         "latest_date": common_dates[-1] if common_dates else "",
         "headline": {
             "current": h_current,
-            "prev_change": round(h_current - h_prev, 1) if h_current and h_prev else 0
+            "prev_change": round(h_current - h_prev, 1) if h_current and h_prev else 0,
+            "stats": card_stats(h_months, h_yoy)
         },
         "core": {
             "current": c_current,
-            "prev_change": round(c_current - c_prev, 1) if c_current and c_prev else 0
+            "prev_change": round(c_current - c_prev, 1) if c_current and c_prev else 0,
+            "stats": card_stats(c_months, c_yoy)
         },
         "dates": common_dates,
         "series": {
@@ -591,44 +2310,34 @@ def fetch_ppi():
 # ═══════════════════════════════════════
 # 11. CPI COMPONENTS (YoY)
 # ═══════════════════════════════════════
-def fetch_cpi_components():
+def fetch_cpi_components(get):
     print("📊 Fetching CPI Components...")
-    components = {
-        "Shelter":   "CUSR0000SAH1",   # 주거 (원래 작동하던 것)
-        "Energy":    "CPIENGSL",        # 에너지 (SA, index)
-        "Food":      "CPIUFDSL",        # 식품 (SA, index)
-        "Transport": "CPITRNSL",        # 교통 (SA, index)
-        "Medical":   "CPIMEDSL",        # 의료 (SA, index)
-        "Apparel":   "CPIAPPSL",        # 의류 (SA, index)
-        "Education": "CPIEDUSL",        # 교육·통신 (SA, index)
-    }
+    components = SERIES_REGISTRY["CPI Components"]
 
     comp_yoy = {}
-    for name, series_id in components.items():
+    for name, spec in components.items():
         try:
-            d, v = fred_fetch(series_id, start="2018-01-01", freq="m")
-            yoy_dates, yoy_vals = calc_yoy_from_index(d, v)
-            comp_yoy[name] = dict(zip(yoy_dates, yoy_vals))
-            print(f"  ✓ {name}: {len(yoy_dates)} data points")
+            comp_yoy[name] = get(f"yoy:CPI Components/{name}")
+            print(f"  ✓ {name}: {len(comp_yoy[name][1])} data points")
         except Exception as e:
-            print(f"  ⚠️ {name} ({series_id}) fetch failed: {e}")
+            print(f"  ⚠️ {name} ({spec['id']}) fetch failed: {e}")
 
     if not comp_yoy:
         print("  ❌ No component data fetched")
         return
 
     # 날짜: 최소 2개 이상의 시리즈에 존재하는 날짜 사용 (strict intersection 대신)
-    all_dates = set()
-    for m in comp_yoy.values():
-        all_dates.update(m.keys())
-    sorted_dates = sorted(all_dates)
+    all_months = np.unique(np.concatenate([months for months, _ in comp_yoy.values()]))
+    sorted_dates = format_dates(all_months)
 
     comp_list = []
     for name in components:
         if name not in comp_yoy:
             continue
-        m = comp_yoy[name]
-        vals = [m.get(d, None) for d in sorted_dates]
+        months, yoy = comp_yoy[name]
+        vals = [None] * len(sorted_dates)
+        for i, y in zip(np.searchsorted(all_months, months).tolist(), yoy):
+            vals[i] = y
         # None이 아닌 마지막 값 찾기
         non_null = [(i, v) for i, v in enumerate(vals) if v is not None]
         if len(non_null) < 2:
@@ -639,6 +2348,7 @@ def fetch_cpi_components():
             "name": name,
             "current": current,
             "prev_change": round(current - prev, 1),
+            "stats": card_stats(months, yoy),
             "series": vals
         })
 
@@ -654,22 +2364,11 @@ def fetch_cpi_components():
 # ═══════════════════════════════════════
 # 12. INFLATION EXPECTATIONS (5Y Breakeven)
 # ═══════════════════════════════════════
-def fetch_inflation_expectations():
+def fetch_inflation_expectations(get):
     print("📐 Fetching Inflation Expectations...")
-    # T5YIE: 5-Year Breakeven Inflation Rate (daily)
-    dates, values = fred_fetch("T5YIE", start="2003-01-01")
-    vals = [round(v, 2) for v in values]
-
     # 월간 평균으로 리샘플링
-    monthly = {}
-    for d, v in zip(dates, vals):
-        ym = d[:7]  # YYYY-MM
-        if ym not in monthly:
-            monthly[ym] = []
-        monthly[ym].append(v)
-
-    monthly_dates = sorted(monthly.keys())
-    monthly_vals = [round(sum(monthly[ym]) / len(monthly[ym]), 2) for ym in monthly_dates]
+    months, monthly_vals = get("monthly:Inflation Expectations/t5yie")
+    monthly_dates = format_dates(months)
 
     current = monthly_vals[-1] if monthly_vals else None
     prev = monthly_vals[-2] if len(monthly_vals) >= 2 else current
@@ -679,48 +2378,590 @@ def fetch_inflation_expectations():
         "latest_date": monthly_dates[-1] if monthly_dates else "",
         "current": current,
         "prev_change": round(current - prev, 2) if current is not None and prev is not None else 0,
+        "stats": card_stats(months, monthly_vals),
         "dates": monthly_dates,
         "values": monthly_vals
     })
     print(f"  → 5Y Breakeven: {current}%")
 
 
+# ═══════════════════════════════════════
+# GRAPH WIRING
+# ═══════════════════════════════════════
+def build_graph(graph):
+    """레지스트리 원본 노드 + 변환 노드 + 출력 파일 노드 등록"""
+    for task, specs in SERIES_REGISTRY.items():
+        for key, spec in specs.items():
+            graph.add(series_node(task, key), fetch_series_node(spec), request=series_request(spec),
+                      afunc=fetch_series_node_async(spec))
+
+    def nodes(task, prefix="fred", skip=()):
+        return [f"{prefix}:{task}/{key}" for key in SERIES_REGISTRY[task] if key not in skip]
+
+    m2 = SERIES_REGISTRY["Global M2"]
+    for key, spec in m2.items():
+        if key != "total":
+            graph.add(f"m2:{key}", m2_country_node(key, spec), [series_node("Global M2", key)])
+    for key in SERIES_REGISTRY["PMI"]:
+        graph.add(f"pmi:{key}", pmi_node(key), [series_node("PMI", key)])
+    for task in ("US CPI", "US PPI", "CPI Components"):
+        for key in SERIES_REGISTRY[task]:
+            graph.add(f"yoy:{task}/{key}", yoy_node(task, key), [series_node(task, key)])
+    for long, short, name in (("10Y", "2Y", "2s10s"), ("10Y", "3M", "3m10y")):
+        graph.add(f"spread:{name}", spread_node(long, short),
+                  [series_node("Yield Curve", long), series_node("Yield Curve", short)])
+    source = series_node("Inflation Expectations", "t5yie")
+    graph.add("monthly:Inflation Expectations/t5yie", monthly_mean_node("Inflation Expectations", "t5yie"), [source])
+
+    outputs = {
+        "m2.json": (fetch_m2, [series_node("Global M2", "total")] + [f"m2:{key}" for key in m2 if key != "total"]),
+        "fed_balance_sheet.json": (fetch_fed_bs, nodes("Fed Balance Sheet")),
+        "yield_curve.json": (fetch_yield_curve, nodes("Yield Curve") + ["spread:2s10s", "spread:3m10y"]),
+        "nfci.json": (fetch_nfci, nodes("NFCI")),
+        "rates.json": (fetch_rates, nodes("Interest Rates")),
+        "debt_gdp.json": (fetch_debt_gdp, nodes("Debt/GDP")),
+        "pmi.json": (fetch_pmi, [f"pmi:{key}" for key in SERIES_REGISTRY["PMI"]]),
+        "unemployment.json": (fetch_unemployment, nodes("Unemployment")),
+        "cpi.json": (fetch_cpi, nodes("US CPI", "yoy")),
+        "ppi.json": (fetch_ppi, nodes("US PPI", "yoy") + [series_node("US PPI", "core")]),
+        "cpi_components.json": (fetch_cpi_components, nodes("CPI Components", "yoy")),
+        "inflation_expectations.json": (fetch_inflation_expectations, ["monthly:Inflation Expectations/t5yie"]),
+    }
+    for output, (func, deps) in outputs.items():
+        graph.add(output, func, deps)
+
+
+build_graph(GRAPH)
+
+
 # ═══════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="글로벌 매크로 대시보드 데이터 수집")
+    parser.add_argument("-j", "--jobs", type=int, default=FETCH_JOBS,
+                        help=f"동시 FRED 요청 수 (기본 {FETCH_JOBS}, 1이면 순차 실행)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="asyncio 이벤트 루프에서 실행 (async_main — 태스크는 코루틴, HTTP 는 fetch 풀 스레드)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="data/raw 에 저장된 원본의 마지막 관측일 이후만 요청해 병합 (변환도 바뀐 꼬리 구간만 재계산)")
+    parser.add_argument("--revision-days", type=int, default=REVISION_DAYS,
+                        help=f"incremental 모드에서 다시 받는 수정 구간 (기본 {REVISION_DAYS}일)")
+    parser.add_argument("--verify-incremental", action="store_true",
+                        help="변환 꼬리 재계산 결과를 전체 재계산과 비교 (다르면 경고 후 전체 결과 사용)")
+    parser.add_argument("--skip-unchanged", action="store_true",
+                        help="FRED 메타데이터 last_updated 가 지난 실행과 같은 시리즈는 data/raw 저장본 사용")
+    parser.add_argument("--only", nargs="+", metavar="OUTPUT",
+                        help="지정한 출력 파일(m2.json 등)이나 페이지(macro-2.html)에 필요한 시리즈만 받아 계산")
+    parser.add_argument("--force", action="store_true",
+                        help="최소 갱신 간격/발표 일정과 상관없이 모든 태스크 실행")
+    parser.add_argument("--plan-releases", action="store_true",
+                        help="FRED 발표 일정상 마지막 성공 이후 발표가 있었던 태스크만 실행 (간격 대신)")
+    parser.add_argument("--min-interval", action="store_true",
+                        help="마지막 성공 후 태스크별 최소 갱신 간격이 지나지 않았으면 건너뜀 (발표 일정으로 판단하는 태스크 제외)")
+    parser.add_argument("--cache-ttl", type=int, default=CACHE_TTL,
+                        help=f"로컬 캐시(.cache/fred)를 재검증 없이 쓰는 시간(초, 기본 {CACHE_TTL}, 0이면 항상 재검증)")
+    parser.add_argument("--no-cache", action="store_true", help="로컬 응답 캐시 사용 안 함")
+    parser.add_argument("--retries", type=int, default=FETCH_RETRIES,
+                        help=f"일시적 오류 재시도 횟수 (기본 {FETCH_RETRIES}, 지수 백오프 + 지터)")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="observations 응답을 스트리밍 대신 r.json() 으로 한 번에 파싱")
+    parser.add_argument("--fallback-delay", type=float, default=FALLBACK_HEDGE_DELAY,
+                        help=f"1순위 시리즈가 이 시간(초) 안에 안 끝나면 대체 시리즈도 요청 (기본 {FALLBACK_HEDGE_DELAY})")
+    parser.add_argument("--hedge", action="store_true",
+                        help="이번 실행의 p90 지연 안에 응답이 없는 요청은 한 번 더 보내고 먼저 온 응답 사용")
+    parser.add_argument("--record", type=Path, default=None, metavar="DIR",
+                        help="모든 HTTP 요청/응답을 DIR 에 녹화 (캐시는 끔)")
+    parser.add_argument("--replay", type=Path, default=None, metavar="DIR",
+                        help="--record 녹화본으로 네트워크 없이 실행 (녹화 때와 같은 옵션·날짜로)")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="재생 시 녹화된 요청 지연에 곱할 배율 (0 = 지연 없이)")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="실행 전체 제한 시간(초) — 넘으면 남은 요청을 취소하고 끝난 태스크의 JSON만 저장")
+    parser.add_argument("--rate-limit", type=int, default=FRED_RATE_LIMIT,
+                        help=f"분당 최대 FRED 요청 수 (기본 {FRED_RATE_LIMIT})")
+    return parser.parse_args(argv)
+
+
+_run_lock = threading.Lock()  # 실행 설정/상태가 모듈 전역이라 한 프로세스에서 실행은 한 번에 하나씩
+_task_results = {}  # 이번 실행 태스크 결과: name → "ok" / "partial"(일부 입력 실패) / "failed" / "deadline"
+
+
+class TaskOutput:
+    """
+    실행 중 sys.stdout 대리 — 병렬 태스크의 print 가 CI 로그에서 섞이지 않게.
+    태스크 스레드(begin~end)의 출력은 모아 두었다가 태스크가 끝날 때 한 번에 쓰고,
+    그 밖의 스레드(fetch 풀의 재시도/경고 등)는 완성된 줄 단위로만 씀
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def begin(self):
+        self.local.buffer = []
+
+    def end(self):
+        text = "".join(self.local.buffer)
+        self.local.buffer = None
+        with self.lock:
+            self.stream.write(text)
+            self.stream.flush()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is not None:
+            buffer.append(text)
+            return len(text)
+        head, newline, tail = (getattr(self.local, "partial", "") + text).rpartition("\n")
+        self.local.partial = tail
+        if newline:
+            with self.lock:
+                self.stream.write(head + newline)
+        return len(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is not None:
+            return  # 태스크 출력은 end() 에서
+        partial, self.local.partial = getattr(self.local, "partial", ""), ""
+        with self.lock:
+            self.stream.write(partial)
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+_task_output = None  # main() 이 설치한 TaskOutput (finish_run 에서 원래 stdout 복원) — async_main 은 설치 안 함
+
+
+def capture_task_output():
+    """sys.stdout 을 TaskOutput 으로 교체 — 프로세스 전체 stdout 이라 CLI(main)에서만, 호스트 서비스(async_main)에선 안 씀"""
+    global _task_output
+    if _task_output is None:
+        _task_output = sys.stdout = TaskOutput(sys.stdout)
+
+
+def run_task(name, output):
+    """태스크 하나 실행 — 출력은 태스크가 끝날 때 한 번에 (TaskOutput)"""
+    if _task_output is not None:
+        _task_output.begin()
+    try:
+        return compute_task(name, output)
+    finally:
+        if _task_output is not None:
+            _task_output.end()
+
+
+def compute_task(name, output):
+    """출력 파일 노드 계산 — 실패해도 다른 태스크에 영향 없음"""
+    try:
+        check_deadline()
+        GRAPH.get(output)
+    except Exception as e:
+        return record_task(name, output, e)
+    return record_task(name, output)
+
+
+def record_task(name, output, error=None):
+    """
+    태스크 결과 기록 (error: 출력 노드 계산이 실패했으면 그 오류).
+    입력 시리즈가 모두 성공했을 때만 상태에 성공 시각 기록 — 일부 국가/항목을 빼고 저장했으면
+    last_success 를 그대로 둬서 다음 실행(--plan-releases/--min-interval)에서도 다시 실행되게 함
+    """
+    if error is not None:
+        left = remaining_time()
+        if isinstance(error, DeadlineExceeded) or (left is not None and left <= 0):
+            print(f"  ⏰ {name} skipped: run deadline exceeded")
+            _task_results[name] = "deadline"
+        else:
+            print(f"  ❌ {name} failed: {error}")
+            _task_results[name] = "failed"
+        return False
+    failed = GRAPH.failed_ancestors([output])
+    if failed:
+        print(f"  ⚠️ {name}: {len(failed)} input(s) failed ({', '.join(failed)}) — 다음 실행에서 다시 시도")
+        _task_results[name] = "partial"
+        return False
+    with _state_lock:
+        RUN_STATE.setdefault("tasks", {}).setdefault(name, {})["last_success"] = datetime.now().isoformat(timespec="seconds")
+    _task_results[name] = "ok"
+    return True
+
+
+def record_deadline_skips(tasks):
+    """제한 시간 때문에 끝나지 못한(시작도 못 한 것 포함) 태스크를 상태 파일에 기록"""
+    skipped = [name for name, _ in tasks if _task_results.get(name, "deadline") == "deadline"]
+    with _state_lock:
+        RUN_STATE["last_run"] = {
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "tasks": {name: _task_results.get(name, "deadline") for name, _ in tasks},
+            "deadline_skipped": skipped,
+        }
+    if skipped:
+        print(f"⏰ Deadline exceeded — skipped: {', '.join(skipped)}")
+
+
+# (태스크 이름, 출력 파일 노드)
+TASKS = [
+    ("Global M2", "m2.json"),
+    ("Fed Balance Sheet", "fed_balance_sheet.json"),
+    ("Yield Curve", "yield_curve.json"),
+    ("NFCI", "nfci.json"),
+    ("Interest Rates", "rates.json"),
+    ("Debt/GDP", "debt_gdp.json"),
+    ("PMI", "pmi.json"),
+    ("Unemployment", "unemployment.json"),
+    ("US CPI", "cpi.json"),
+    ("US PPI", "ppi.json"),
+    ("CPI Components", "cpi_components.json"),
+    ("Inflation Expectations", "inflation_expectations.json"),
+]
+ONLY_OUTPUTS = None  # --only: 이 출력 파일(과 그 조상 노드)만 계산
+
+
+def resolve_outputs(targets):
+    """
+    --only 인자 → 출력 파일 노드 집합. json 파일명은 그대로, html 페이지는 fetch 하는 json 을 찾아서
+    (예: macro-2.html → rates/debt_gdp/pmi/unemployment)
+    """
+    known = {output for _, output in TASKS}
+    outputs = set()
+    for target in targets:
+        name = Path(target).name
+        if name.endswith(".html"):
+            page = Path(target) if Path(target).exists() else Path(__file__).parent / name
+            if not page.exists():
+                raise SystemExit(f"❌ --only: 페이지를 찾을 수 없음 '{target}'")
+            outputs.update(m for m in re.findall(r"[\w-]+\.json", page.read_text(encoding="utf-8")) if m in known)
+        elif name in known:
+            outputs.add(name)
+        else:
+            raise SystemExit(f"❌ --only: 알 수 없는 출력 '{target}' ({', '.join(sorted(known))} 또는 *.html)")
+    return outputs
+
+
+# ═══════════════════════════════════════
+# REFRESH PLANNER (최소 갱신 간격 + FRED 발표 일정)
+# ═══════════════════════════════════════
+FORCE = False              # --force: 간격/발표 일정과 상관없이 모든 태스크 실행
+PLAN_RELEASES = False      # --plan-releases: 마지막 성공 이후 발표가 있었던 태스크만 실행
+MIN_INTERVAL = False       # --min-interval: TASK_REFRESH_INTERVALS 가 지나지 않은 태스크 건너뜀 (기본은 매번 실행)
+CALENDAR_REFRESH_DAYS = 7  # 저장된 발표 일정을 다시 받는 주기 (다가올 일정이 없으면 매번)
+CALENDAR_LOOKBACK_DAYS = 400
+
+# 태스크별 최소 갱신 간격 (--min-interval) — 마지막 성공 후 이 시간이 지나야 다시 실행 (일간 cron 지터 감안).
+# 발표 시점이 아니라 마지막 성공 기준이라 월간 지표는 발표 후에도 최대 한 달 가까이 늦게 반영될 수 있음 →
+# 정기 실행은 --plan-releases 로 발표 일정에 맞추고, 이 간격은 발표 일정이 없는 환경에서 요청을 줄일 때만 사용
+TASK_REFRESH_INTERVALS = {
+    "Yield Curve": timedelta(hours=20),
+    "Inflation Expectations": timedelta(hours=20),
+    "Fed Balance Sheet": timedelta(days=6),
+    "NFCI": timedelta(days=6),
+    "Interest Rates": timedelta(days=6),   # 정책금리 변경은 빨리 반영
+    "Global M2": timedelta(days=27),
+    "PMI": timedelta(days=27),
+    "Unemployment": timedelta(days=27),
+    "US CPI": timedelta(days=27),
+    "US PPI": timedelta(days=27),
+    "CPI Components": timedelta(days=27),
+    "Debt/GDP": timedelta(days=90),        # 대부분 연간, 미국만 분기
+}
+
+# 태스크별 발표 기준 시리즈 — 이 시리즈들이 속한 release 의 발표일로 실행 여부 판단.
+# 목록에 없는 태스크(일드커브, 기대인플레이션 등 일간 시장 데이터)는 항상 실행
+TASK_RELEASE_SERIES = {
+    "Global M2": ["M2SL", "USAMABMM301GYSAM"],       # H.6, OECD MEI
+    "Fed Balance Sheet": ["WALCL"],                   # H.4.1
+    "NFCI": ["NFCI"],                                 # Chicago Fed NFCI
+    # FOMC·ECB 금리 결정 발표 + OECD MEI, IMF IFS — 정책금리 변경이 월간 OECD/IMF 발표를 기다리지 않게
+    "Interest Rates": ["DFEDTARU", "ECBMRRFR", "IRSTCI01KRM156N", "INTDSRCNM193N"],
+    "Debt/GDP": ["GFDEGDQ188S", "GGGDTAJPA188N"],    # 연방부채, IMF WEO
+    "PMI": ["USALOLITONOSTSAM"],                      # OECD MEI (CLI)
+    "Unemployment": ["UNRATE", "LRUN64TTKRM156S"],   # Employment Situation, OECD MEI
+    "US CPI": ["CPIAUCSL"],                           # CPI
+    "US PPI": ["PPIACO"],                             # PPI
+    "CPI Components": ["CUSR0000SAH1"],               # CPI
+}
+
+
+def release_id_for(series_id):
+    """시리즈가 속한 FRED release id (상태 파일에 영구 캐시, 실패 시 None)"""
+    with _state_lock:
+        known = RUN_STATE.get("releases", {}).get("series", {})
+        if series_id in known:
+            return known[series_id]
+    try:
+        r = http_get(FRED_RELEASE_URL, {"series_id": series_id, "api_key": FRED_KEY, "file_type": "json"})
+        r.raise_for_status()
+        release_id = r.json()["releases"][0]["id"]
+    except Exception as e:
+        print(f"  ⚠️ {series_id} release lookup failed: {e}")
+        return None
+    with _state_lock:
+        RUN_STATE.setdefault("releases", {}).setdefault("series", {})[series_id] = release_id
+    return release_id
+
+
+def release_calendar(release_id):
+    """
+    release 의 발표일 목록 (최근 CALENDAR_LOOKBACK_DAYS 일 + 예정일).
+    상태 파일의 로컬 캘린더를 쓰고, 오래됐거나 다가올 일정이 없으면 다시 받음. 실패 시 None
+    """
+    key = str(release_id)
+    with _state_lock:
+        entry = RUN_STATE.get("releases", {}).get("calendar", {}).get(key)
+    if entry:
+        age = (date.fromisoformat(TODAY) - date.fromisoformat(entry["fetched"])).days
+        if age < CALENDAR_REFRESH_DAYS and entry["dates"] and entry["dates"][-1] >= TODAY:
+            return entry["dates"]
+
+    since = (date.fromisoformat(TODAY) - timedelta(days=CALENDAR_LOOKBACK_DAYS)).isoformat()
+    try:
+        r = http_get(FRED_RELEASE_DATES_URL, {
+            "release_id": release_id,
+            "api_key": FRED_KEY,
+            "file_type": "json",
+            "realtime_start": since,
+            "realtime_end": "9999-12-31",
+            "include_release_dates_with_no_data": "true",
+            "sort_order": "asc",
+        })
+        r.raise_for_status()
+        dates = sorted({d["date"] for d in r.json().get("release_dates", []) if d["date"] >= since})
+    except Exception as e:
+        print(f"  ⚠️ release {release_id} calendar fetch failed: {e}")
+        return entry["dates"] if entry else None
+    with _state_lock:
+        RUN_STATE.setdefault("releases", {}).setdefault("calendar", {})[key] = {"fetched": TODAY, "dates": dates}
+    return dates
+
+
+def released_since_last_success(name):
+    """
+    태스크의 마지막 성공 이후(같은 날 포함) 기준 시리즈 발표가 있었는지.
+    발표 일정을 모르거나 성공 기록이 없으면 True (실행 쪽으로 판단)
+    """
+    series_ids = TASK_RELEASE_SERIES.get(name)
+    with _state_lock:
+        last = RUN_STATE.get("tasks", {}).get(name, {}).get("last_success")
+    if not series_ids or not last:
+        return True
+    for series_id in series_ids:
+        release_id = release_id_for(series_id)
+        dates = release_calendar(release_id) if release_id is not None else None
+        if dates is None or any(last[:10] <= d <= TODAY for d in dates):
+            return True
+    return False
+
+
+def task_due(name):
+    """
+    태스크 실행 여부 판단. Returns: (실행 여부, 건너뛰는 사유)
+    --plan-releases 이고 발표 기준 시리즈가 있는 태스크는 발표 일정으로만 판단 (발표가 있으면 간격 무시),
+    나머지는 --min-interval 일 때만 마지막 성공 후 TASK_REFRESH_INTERVALS 경과 여부로 판단 (아니면 항상 실행)
+    """
+    with _state_lock:
+        last = RUN_STATE.get("tasks", {}).get(name, {}).get("last_success")
+    if not last:
+        return True, ""
+    if PLAN_RELEASES and name in TASK_RELEASE_SERIES:
+        if released_since_last_success(name):
+            return True, ""
+        return False, f"마지막 성공({last[:10]}) 이후 발표 없음"
+    if not MIN_INTERVAL:
+        return True, ""
+    interval = TASK_REFRESH_INTERVALS.get(name, timedelta(0))
+    if datetime.now() - datetime.fromisoformat(last) >= interval:
+        return True, ""
+    span = f"{interval.days}일" if interval.days else f"{interval.seconds // 3600}시간"
+    return False, f"최소 갱신 간격 {span} 미경과 (마지막 성공 {last.replace('T', ' ')})"
+
+
+def select_tasks():
+    """이번 실행에서 돌릴 태스크 목록 (--force 이거나 --plan-releases/--min-interval 이 없으면 전체)"""
+    tasks = [(name, output) for name, output in TASKS if ONLY_OUTPUTS is None or output in ONLY_OUTPUTS]
+    if FORCE or not (PLAN_RELEASES or MIN_INTERVAL):
+        return tasks
+    decisions = list(get_fetch_pool().map(task_due, [name for name, _ in tasks]))
+    selected = []
+    for (name, output), (is_due, reason) in zip(tasks, decisions):
+        if is_due:
+            selected.append((name, output))
+        else:
+            print(f"  ⏭️ {name}: {reason} — 건너뜀")
+    print(f"🗓️ Planner: {len(selected)}/{len(tasks)} tasks due (--force 로 전체 실행)")
+    print()
+    return selected
+
+
+def start_run(args):
+    """실행 설정 적용 + 헤더 출력. API 키가 없으면 False"""
+    global RECORD_DIR, REPLAY_DIR, REPLAY_SPEED, RUN_DEADLINE, HEDGE_REQUESTS, FALLBACK_HEDGE_DELAY, STREAM_PARSE, FETCH_JOBS, INCREMENTAL, REVISION_DAYS, SKIP_UNCHANGED, PLAN_RELEASES, MIN_INTERVAL, FORCE, CACHE_ENABLED, CACHE_TTL, FRED_RATE_LIMIT, FETCH_RETRIES, ONLY_OUTPUTS, VERIFY_INCREMENTAL
+    FETCH_JOBS = max(1, args.jobs)
+    INCREMENTAL = args.incremental
+    VERIFY_INCREMENTAL = args.verify_incremental
+    REVISION_DAYS = max(0, args.revision_days)
+    SKIP_UNCHANGED = args.skip_unchanged
+    PLAN_RELEASES = args.plan_releases
+    MIN_INTERVAL = args.min_interval
+    FORCE = args.force
+    STREAM_PARSE = not args.no_stream
+    FALLBACK_HEDGE_DELAY = max(0.0, args.fallback_delay)
+    HEDGE_REQUESTS = args.hedge
+    RUN_DEADLINE = time.monotonic() + args.deadline if args.deadline else None
+    RECORD_DIR = args.record
+    REPLAY_DIR = args.replay
+    REPLAY_SPEED = max(0.0, args.replay_speed)
+    if RECORD_DIR is not None:
+        RECORD_DIR.mkdir(parents=True, exist_ok=True)
+    # 캐시 적중/304 는 녹화·재생을 비결정적으로 만듦
+    CACHE_ENABLED = not (args.no_cache or RECORD_DIR or REPLAY_DIR)
+    CACHE_TTL = max(0, args.cache_ttl)
+    FRED_RATE_LIMIT = max(1, args.rate_limit)
+    FETCH_RETRIES = max(0, args.retries)
+    ONLY_OUTPUTS = resolve_outputs(args.only) if args.only else None
+    RUN_STATS.clear()
+    GRAPH.reset()
+    _series_meta.clear()
+    _raw_changes.clear()
+    _latencies.clear()
+    _task_results.clear()
+    _replay_counts.clear()
+    RUN_STATE.clear()
+    RUN_STATE.update(load_state())
+
     print(f"🚀 글로벌 매크로 대시보드 데이터 수집 시작 ({TODAY})")
     print(f"   FRED API Key: {'✅ 설정됨' if FRED_KEY else '❌ 없음'}")
+    print(f"   동시 요청 수: {FETCH_JOBS}{' (async)' if args.use_async else ''}")
+    if RUN_DEADLINE is not None:
+        print(f"   Deadline: {args.deadline:.0f}s")
+    if RECORD_DIR is not None:
+        print(f"   Record: {RECORD_DIR}")
+    if REPLAY_DIR is not None:
+        print(f"   Replay: {REPLAY_DIR} (지연 x{REPLAY_SPEED:g})")
+    if INCREMENTAL:
+        print(f"   Incremental: 마지막 관측일 - {REVISION_DAYS}일부터 요청"
+              + (" (변환 꼬리 재계산 검증)" if VERIFY_INCREMENTAL else ""))
+    if SKIP_UNCHANGED:
+        print("   Skip unchanged: FRED last_updated 가 같으면 저장본 사용")
+    if ONLY_OUTPUTS is not None:
+        print(f"   Only: {', '.join(sorted(ONLY_OUTPUTS))}")
     print()
 
-    if not FRED_KEY:
+    if not FRED_KEY and REPLAY_DIR is None:
         print("❌ FRED_API_KEY 환경변수를 설정해주세요.")
         print("   https://fred.stlouisfed.org/docs/api/api_key.html 에서 무료 발급")
+        return False
+    return True
+
+
+def finish_run(started):
+    """HTTP 통계 출력 + 실행 상태 저장 + fetch 엔진 정리 + stdout 복원"""
+    global _task_output
+    stats = session_stats()
+    close_fetch_engine()
+    if REPLAY_DIR is None:  # 재생 실패는 실제 시리즈 상태가 아님
+        update_breaker()
+    save_state()
+    print()
+    print(f"🔌 HTTP: {stats['requests']} requests / {stats['connections']} connections ({stats['reused']} reused)")
+    print(f"📦 Downloaded: {RUN_STATS['bytes'] / 1024:.0f} KB"
+          + (f" ({RUN_STATS['incremental']} series incremental)" if INCREMENTAL else ""))
+    if HEDGE_REQUESTS:
+        print(f"🦔 Hedging: {RUN_STATS['hedges_sent']} duplicate requests sent, {RUN_STATS['hedges_won']} won")
+    print(f"🪂 Fallbacks: {RUN_STATS['fallback_launched']} hedged, {RUN_STATS['fallback_used']} used")
+    print(f"🧮 Graph: {RUN_STATS['graph_evaluated']} nodes evaluated, {RUN_STATS['graph_hits']} memo hits")
+    if INCREMENTAL or SKIP_UNCHANGED:
+        print(f"♻️ Derived: {RUN_STATS['derived_tail']} tail recomputed, {RUN_STATS['derived_reused']} reused, "
+              f"{RUN_STATS['derived_full']} full"
+              + (f", {RUN_STATS['derived_mismatch']} verify mismatches" if VERIFY_INCREMENTAL else ""))
+    print(f"🔗 Coalesced: {RUN_STATS['coalesced']} of {RUN_STATS['fetch_calls']} fred_fetch calls reused another request")
+    if SKIP_UNCHANGED:
+        print(f"🏷️ Metadata: {RUN_STATS['meta_requests']} lookups, {RUN_STATS['unchanged']} series unchanged (skipped)")
+    print(f"⏱️ Rate limit: {RUN_STATS['rate_waits']} requests queued, {RUN_STATS['rate_wait_s']:.1f}s waited, "
+          f"{RUN_STATS['rate_limited']} x 429")
+    print(f"🔁 Retries: {RUN_STATS['retries']}, circuit-open skips: {RUN_STATS['breaker_skipped']}")
+    if RECORD_DIR is not None or REPLAY_DIR is not None:
+        print(f"📼 Record/replay: {RUN_STATS['recorded']} recorded, {RUN_STATS['replayed']} replayed")
+    if CACHE_ENABLED:
+        print(f"🗄️ Cache: {RUN_STATS['cache_hits']} hits, {RUN_STATS['cache_revalidated']} revalidated (304)")
+    print(f"✅ 데이터 수집 완료! ({time.monotonic() - started:.1f}s)")
+    if _task_output is not None:
+        _task_output.flush()
+        sys.stdout = _task_output.stream
+        _task_output = None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.use_async:
+        asyncio.run(async_main(argv))
         return
+    with _run_lock:
+        if not start_run(args):
+            return
+        capture_task_output()
+
+        # 태스크도 병렬 실행 — 실제 HTTP 동시성은 공유 fetch 풀(FETCH_JOBS)이 제한
+        started = time.monotonic()
+        tasks = select_tasks()
+        plan_fetches([output for _, output in tasks])
+        with ThreadPoolExecutor(max_workers=max(1, min(FETCH_JOBS, len(tasks))), thread_name_prefix="task") as task_pool:
+            futures = [task_pool.submit(run_task, name, output) for name, output in tasks]
+            # 제한 시간이 지나면 시작 안 한 태스크는 취소 — 진행 중인 태스크는 요청이 DeadlineExceeded 로 곧 끝남
+            _, not_done = wait(futures, timeout=remaining_time())
+            for future in not_done:
+                future.cancel()
+        record_deadline_skips(tasks)
+        finish_run(started)
+
+
+async def run_task_async(name, output):
+    """
+    태스크 하나를 코루틴으로 실행 — 출력 노드가 의존하는 시리즈를 asyncio.gather 로 함께 기다리고
+    (GRAPH.aget), 모두 모이면 변환/저장만 executor 에서. 결과 기록은 동기 경로와 같음
+    """
+    try:
+        check_deadline()
+        await GRAPH.aget(output)
+    except Exception as e:
+        return record_task(name, output, e)
+    return record_task(name, output)
 
-    tasks = [
-        ("Global M2", fetch_m2),
-        ("Fed Balance Sheet", fetch_fed_bs),
-        ("Yield Curve", fetch_yield_curve),
-        ("NFCI", fetch_nfci),
-        ("Interest Rates", fetch_rates),
-        ("Debt/GDP", fetch_debt_gdp),
-        ("PMI", fetch_pmi),
-        ("Unemployment", fetch_unemployment),
-        ("US CPI", fetch_cpi),
-        ("US PPI", fetch_ppi),
-        ("CPI Components", fetch_cpi_components),
-        ("Inflation Expectations", fetch_inflation_expectations),
-    ]
-
-    for name, func in tasks:
-        try:
-            func()
-        except Exception as e:
-            print(f"  ❌ {name} failed: {e}")
 
-    print()
-    print("✅ 데이터 수집 완료!")
+async def async_main(argv=()):
+    """
+    비동기 진입점. 이벤트 루프를 가진 서비스에서 `await async_main()` 으로 호출.
+    태스크는 코루틴(run_task_async), 시리즈는 fred_fetch_async/fred_fetch_first_async 로 기다림 —
+    HTTP 는 fetch 풀 스레드가 보내지만 응답을 기다리는 태스크/시리즈가 스레드를 잡지 않음.
+    설정/계획/정리와 변환 계산은 executor 에서 실행해 호스트 이벤트 루프를 막지 않고, sys.stdout 은 건드리지 않음.
+    실행 설정이 모듈 전역이라 겹친 호출은 차례로 실행 (_run_lock).
+    argv 기본값은 빈 인자 — 호스트 프로세스의 sys.argv를 읽지 않음.
+    """
+    loop = asyncio.get_running_loop()
+    args = parse_args(argv)
+    args.use_async = True
+    while not _run_lock.acquire(blocking=False):
+        await asyncio.sleep(0.1)  # 이벤트 루프를 막지 않고, 기다리다 취소돼도 잠금이 새지 않게 폴링
+    try:
+        if not await loop.run_in_executor(None, start_run, args):
+            return
+
+        started = time.monotonic()
+        tasks = await loop.run_in_executor(None, select_tasks)
+        await loop.run_in_executor(None, plan_fetches, [output for _, output in tasks])
+        pending = [asyncio.ensure_future(run_task_async(name, output)) for name, output in tasks]
+        left = remaining_time()
+        _, not_done = await asyncio.wait(pending, timeout=None if left is None else max(0.0, left))
+        if not_done:
+            # 진행 중인 태스크는 요청이 DeadlineExceeded 로 곧 끝나므로 마무리를 기다림
+            await asyncio.wait(not_done)
+        await loop.run_in_executor(None, record_deadline_skips, tasks)
+        await loop.run_in_executor(None, finish_run, started)
+    finally:
+        _run_lock.release()
 
 
 if __name__ == "__main__":
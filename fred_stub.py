@@ -0,0 +1,317 @@
+"""
+FRED API 로컬 대역 서버 — 네트워크/API 키 없이 fetch_data.py 실행·벤치마크
+fred/series/observations 와 메타데이터 엔드포인트(series, series/release, release/dates)를 흉내냄
+
+사용법:
+  python fred_stub.py [--port 8765] [--fixtures DIR] [--latency 0.05 --jitter 0.02]
+                      [--tail-prob 0.1 --tail-latency 1.0] [--rate-limit 120 | --error-rate 0.05]
+                      [--fail SID,SID]
+  FRED_BASE=http://127.0.0.1:8765/fred FRED_API_KEY=test python fetch_data.py
+
+데이터:
+  --fixtures DIR 의 {SID}.json (FRED observations 응답 그대로) 또는
+  {SID}_{freq|native}.json (fetch_data.py 원본 저장소 data/raw 형식)을 씀.
+  없는 시리즈는 시리즈 ID로 시드한 합성 데이터 (같은 ID → 항상 같은 값, "." 결측 포함)
+"""
+
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+SYNTH_START = date(1913, 1, 1)
+SYNTH_MISSING = 0.02  # 합성 데이터 결측(".") 비율
+LAST_UPDATED = "2026-10-01 07:44:02-05"
+
+# 합성 데이터 원래 주기 (접두어 기준, 나머지는 월간)
+NATIVE_FREQ = {
+    "DGS": "d", "DFF": "d", "DTB": "d", "T5YIE": "d", "T10YIE": "d", "T5YIFR": "d",
+    "WALCL": "w", "NFCI": "w", "ANFCI": "w",
+    "GFDEGDQ": "q", "GDP": "q",
+    "GGGDT": "a",
+}
+FREQ_ORDER = "dwmqa"  # 세밀 → 거친 순
+PERIODS_PER_YEAR = {"d": 260, "w": 52, "m": 12, "q": 4, "a": 1}
+
+
+# ═══════════════════════════════════════════
+# 데이터
+# ═══════════════════════════════════════════
+
+def native_freq(series_id):
+    for prefix, freq in NATIVE_FREQ.items():
+        if series_id.startswith(prefix):
+            return freq
+    return "m"
+
+
+def next_date(d, freq):
+    if freq == "a":
+        return date(d.year + 1, 1, 1)
+    if freq == "q":
+        m = d.month + 3
+        return date(d.year + (m > 12), (m - 1) % 12 + 1, 1)
+    if freq == "m":
+        return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+    if freq == "w":
+        return d + timedelta(days=7)
+    d += timedelta(days=1)
+    while d.weekday() >= 5:
+        d += timedelta(days=1)
+    return d
+
+
+def period_start(d, freq):
+    """FRED 주기 집계 기간 시작일 (주간은 금요일 기준)"""
+    if freq == "a":
+        return d.replace(month=1, day=1)
+    if freq == "q":
+        return d.replace(month=(d.month - 1) // 3 * 3 + 1, day=1)
+    if freq == "m":
+        return d.replace(day=1)
+    if freq == "w":
+        return d + timedelta(days=(4 - d.weekday()) % 7)
+    return d
+
+
+def synthetic(series_id, end):
+    """시리즈 ID로 시드한 랜덤 워크 (연 2% 추세) — (주기, [(date_str, value_str)])"""
+    rnd = random.Random(int(hashlib.md5(series_id.encode()).hexdigest()[:8], 16))
+    freq = native_freq(series_id)
+    per_year = PERIODS_PER_YEAR[freq]
+    d = SYNTH_START if freq != "w" else period_start(SYNTH_START, "w")
+    level = rnd.uniform(1, 200)
+    out = []
+    while d <= end:
+        level *= math.exp(rnd.gauss(0.02 / per_year, 0.03 / math.sqrt(per_year)))
+        missing = rnd.random() < SYNTH_MISSING
+        out.append((d.isoformat(), "." if missing else f"{level:.3f}"))
+        d = next_date(d, freq)
+    return freq, out
+
+
+def load_fixture(fixtures, series_id, freq):
+    """
+    픽스처 파일 → (주기, [(date_str, value_str)]) — 없으면 None.
+    요청 주기 그대로의 파일이 있으면 우선, 없으면 원래 주기 파일을 집계해서 씀
+    """
+    if fixtures is None:
+        return None
+    candidates = [(f"{series_id}_native.json", None), (f"{series_id}.json", None)]
+    if freq:
+        candidates.insert(0, (f"{series_id}_{freq}.json", freq))
+    for name, file_freq in candidates:
+        path = fixtures / name
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if "observations" in data:
+            obs = [(o["date"], o["value"]) for o in data["observations"]]
+        else:  # data/raw 형식
+            obs = [(d, "." if v != v else repr(float(v))) for d, v in zip(data["dates"], data["values"])]
+        return file_freq or data.get("freq"), obs
+    return None
+
+
+def aggregate(obs, freq):
+    """FRED frequency= 집계 (기본 avg, 결측 제외)"""
+    buckets = {}
+    for d, v in obs:
+        key = period_start(date.fromisoformat(d), freq).isoformat()
+        values = buckets.setdefault(key, [])
+        if v != ".":
+            values.append(float(v))
+    return [(k, f"{sum(vs) / len(vs):.3f}" if vs else ".") for k, vs in sorted(buckets.items())]
+
+
+def observations(fixtures, series_id, freq, start, end):
+    """요청 파라미터에 맞춘 관측치 목록. 더 세밀한 주기 요청은 None (FRED 와 같이 400)"""
+    loaded = load_fixture(fixtures, series_id, freq)
+    if loaded is None:
+        loaded = synthetic(series_id, end)
+    native, obs = loaded
+    if freq and freq != native:
+        if native and FREQ_ORDER.index(freq) < FREQ_ORDER.index(native):
+            return None
+        obs = aggregate(obs, freq)
+    start, end = start.isoformat(), end.isoformat()
+    return [(d, v) for d, v in obs if start <= d <= end]
+
+
+def release_id(series_id):
+    return 10 + int(hashlib.md5(series_id.encode()).hexdigest()[:4], 16) % 40
+
+
+def release_dates(rid, since, until):
+    """매월 같은 날 발표 (release id 로 날짜 결정)"""
+    day = 1 + rid % 28
+    d = date(since.year, since.month, day)
+    out = []
+    while d <= until:
+        if d >= since:
+            out.append(d.isoformat())
+        d = date(d.year + (d.month == 12), d.month % 12 + 1, day)
+    return out
+
+
+# ═══════════════════════════════════════════
+# HTTP
+# ═══════════════════════════════════════════
+
+class Limiter:
+    """FRED 처럼 분당 요청 수 제한 (고정 창) — 넘으면 429"""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.window = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Returns: 허용이면 0, 아니면 Retry-After 초"""
+        with self.lock:
+            now = time.time()
+            window = int(now // 60)
+            if window != self.window:
+                self.window, self.count = window, 0
+            self.count += 1
+            if self.count <= self.per_minute:
+                return 0
+            return int(60 - now % 60) + 1
+
+
+def make_handler(args):
+    limiter = Limiter(args.rate_limit) if args.rate_limit else None
+    today = date.fromisoformat(args.today) if args.today else date.today()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *a):
+            if args.verbose:
+                super().log_message(*a)
+
+        def send_json(self, status, payload, headers=()):
+            body = json.dumps(payload, separators=(",", ":")).encode()
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+            self.send_response(status)
+            for k, v in headers:
+                self.send_header(k, v)
+            if status in (200, 304):
+                self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def error(self, status, message):
+            self.send_json(status, {"error_code": status, "error_message": message})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            delay = args.latency + random.uniform(0, args.jitter)
+            if random.random() < args.tail_prob:
+                delay += args.tail_latency
+            time.sleep(delay)
+
+            if limiter is not None:
+                retry_after = limiter.allow()
+                if retry_after:
+                    self.send_json(429, {"error_code": 429, "error_message": "Too Many Requests.  Exceeded Rate Limit"},
+                                   [("Retry-After", str(retry_after))])
+                    return
+            if random.random() < args.error_rate:
+                self.send_json(429, {"error_code": 429, "error_message": "Too Many Requests.  Exceeded Rate Limit"},
+                               [("Retry-After", "1")])
+                return
+            if not q.get("api_key"):
+                self.error(400, "Bad Request.  Variable api_key is not set.")
+                return
+
+            series_id = q.get("series_id", "")
+            if series_id in args.fail:
+                self.error(400, "Bad Request.  The series does not exist.")
+                return
+
+            path = url.path.rstrip("/")
+            if path.endswith("/series/observations"):
+                start = date.fromisoformat(q.get("observation_start", "1776-07-04"))
+                end = date.fromisoformat(q.get("observation_end", "9999-12-31"))
+                obs = observations(args.fixtures, series_id, q.get("frequency"), start, min(end, today))
+                if obs is None:
+                    self.error(400, "Bad Request.  The value for variable frequency is not one of the values allowed.")
+                    return
+                rt = today.isoformat()
+                self.send_json(200, {
+                    "realtime_start": rt, "realtime_end": rt,
+                    "observation_start": start.isoformat(), "observation_end": end.isoformat(),
+                    "units": "lin", "output_type": 1, "file_type": "json", "order_by": "observation_date",
+                    "sort_order": "asc", "count": len(obs), "offset": 0, "limit": 100000,
+                    "observations": [{"realtime_start": rt, "realtime_end": rt, "date": d, "value": v} for d, v in obs],
+                })
+            elif path.endswith("/series/release"):
+                rid = release_id(series_id)
+                self.send_json(200, {"releases": [{"id": rid, "name": f"Release {rid}"}]})
+            elif path.endswith("/series"):
+                self.send_json(200, {"seriess": [{"id": series_id, "frequency_short": native_freq(series_id).upper(),
+                                                  "last_updated": LAST_UPDATED}]})
+            elif path.endswith("/release/dates"):
+                rid = int(q.get("release_id", 0))
+                since = date.fromisoformat(q.get("realtime_start", today.isoformat()))
+                until = min(date.fromisoformat(q.get("realtime_end", "9999-12-31")), today + timedelta(days=90))
+                self.send_json(200, {"release_dates": [{"release_id": rid, "date": d} for d in release_dates(rid, since, until)]})
+            else:
+                self.error(404, "Not Found")
+
+    return Handler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FRED API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=Path, default=None, help="픽스처 디렉터리 (없는 시리즈는 합성 데이터)")
+    parser.add_argument("--latency", type=float, default=0.05, help="요청당 기본 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 균등 지연 최대값(초)")
+    parser.add_argument("--tail-prob", type=float, default=0.0, help="꼬리 지연이 붙을 확률")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="꼬리 지연(초)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="분당 허용 요청 수 (0 = 무제한, FRED 는 120)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 429 응답 확률")
+    parser.add_argument("--fail", type=lambda s: set(filter(None, s.split(","))), default=set(),
+                        help="항상 400 을 돌려줄 시리즈 ID (쉼표 구분)")
+    parser.add_argument("--today", default=None, help="기준일 YYYY-MM-DD (기본: 오늘) — 재현용")
+    parser.add_argument("--seed", type=int, default=None, help="지연/오류 주입 난수 시드")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args))
+    server.daemon_threads = True
+    print(f"🧪 FRED stub: http://{args.host}:{args.port}/fred")
+    print(f"   FRED_BASE=http://{args.host}:{args.port}/fred FRED_API_KEY=test python fetch_data.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()